@@ -0,0 +1,50 @@
+from tsg_common.tiles.coverage import CoverageIndex
+from tsg_common.tiles.tile_math import tile_mercator_bounds
+
+
+def _box_inside(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """A small box in the middle of a tile."""
+    xmin, ymin, xmax, ymax = tile_mercator_bounds(z, x, y)
+    dx, dy = (xmax - xmin) / 4, (ymax - ymin) / 4
+    return xmin + dx, ymin + dy, xmax - dx, ymax - dy
+
+
+def test_marks_only_tiles_with_features():
+    index = CoverageIndex.from_mercator_boxes([_box_inside(8, 40, 90)], 8)
+    assert not index.is_empty(8, 40, 90)
+    assert index.is_empty(8, 42, 90)
+    assert index.is_empty(8, 200, 10)
+
+
+def test_ancestors_are_marked():
+    index = CoverageIndex.from_mercator_boxes([_box_inside(8, 40, 90)], 8)
+    for z in range(8):
+        shift = 8 - z
+        assert not index.is_empty(z, 40 >> shift, 90 >> shift)
+    assert index.is_empty(2, 3, 3)
+
+
+def test_deeper_zooms_use_ancestor():
+    index = CoverageIndex.from_mercator_boxes([_box_inside(8, 40, 90)], 8)
+    assert not index.is_empty(12, 40 << 4, 90 << 4)
+    assert index.is_empty(12, 42 << 4, 90 << 4)
+
+
+def test_render_buffer_marks_neighbour():
+    # just inside the right edge of (10, 300, 400): drawn in the neighbour's
+    # buffer too, but not two tiles over
+    xmin, ymin, xmax, ymax = tile_mercator_bounds(10, 300, 400)
+    box = (xmax - 10, ymin + 100, xmax - 5, ymin + 200)
+    index = CoverageIndex.from_mercator_boxes([box], 12)
+    assert not index.is_empty(10, 300, 400)
+    assert not index.is_empty(10, 301, 400)
+    assert index.is_empty(10, 302, 400)
+
+
+def test_blob_round_trip():
+    index = CoverageIndex.from_mercator_boxes(
+        [_box_inside(6, 10, 20), _box_inside(6, 50, 30)], 6
+    )
+    restored = CoverageIndex.from_blobs(index.to_blobs())
+    assert restored.max_zoom == 6
+    assert restored.levels == index.levels
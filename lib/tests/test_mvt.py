@@ -0,0 +1,97 @@
+from tsg_common.tiles import mvt
+from tsg_common.tiles.mvt import overzoom
+
+
+def _feature(geom_type: int, parts: list[list[tuple[int, int]]], id: int = 0):
+    body = mvt._varint(1 << 3) + mvt._varint(id) if id else b""
+    body += mvt._varint(mvt._FEATURE_TYPE << 3) + mvt._varint(geom_type)
+    body += mvt._length_delimited(
+        mvt._FEATURE_GEOMETRY, mvt._packed(mvt._encode_geometry(geom_type, parts))
+    )
+    return mvt._length_delimited(mvt._LAYER_FEATURES, body)
+
+
+def _tile(layers: dict[str, list[bytes]]) -> bytes:
+    out = b""
+    for name, features in layers.items():
+        layer = mvt._length_delimited(1, name.encode()) + b"".join(features)
+        out += mvt._length_delimited(mvt._TILE_LAYERS, layer)
+    return out
+
+
+def _decode(tile: bytes) -> dict[str, list[tuple[int, int, list]]]:
+    """{layer name: [(id, type, parts)]}"""
+    layers = {}
+    for _, _, layer, _ in mvt._fields(tile):
+        name, features = None, []
+        for field, _, value, _ in mvt._fields(layer):
+            if field == 1:
+                name = value.decode()
+            elif field == mvt._LAYER_FEATURES:
+                id = geom_type = 0
+                parts: list = []
+                for f_field, _, f_value, _ in mvt._fields(value):
+                    if f_field == 1:
+                        id = f_value
+                    elif f_field == mvt._FEATURE_TYPE:
+                        geom_type = f_value
+                    elif f_field == mvt._FEATURE_GEOMETRY:
+                        parts = [
+                            points
+                            for _, points in mvt._decode_geometry(
+                                mvt._unpacked(f_value)
+                            )
+                        ]
+                features.append((id, geom_type, parts))
+        layers[name] = features
+    return layers
+
+
+def test_point_is_rescaled_into_child():
+    parent = _tile({"places": [_feature(mvt._POINT, [[(3000, 1000)]], id=7)]})
+    child = _decode(overzoom(parent, 1, 1, 0))
+    assert child == {"places": [(7, mvt._POINT, [[(1904, 2000)]])]}
+
+
+def test_features_outside_child_are_dropped():
+    parent = _tile(
+        {
+            "places": [
+                _feature(mvt._POINT, [[(100, 100)]], id=1),
+                _feature(mvt._POINT, [[(3000, 100)]], id=2),
+            ]
+        }
+    )
+    child = _decode(overzoom(parent, 1, 1, 0))
+    assert [id for id, _, _ in child["places"]] == [2]
+
+
+def test_empty_layers_are_dropped():
+    parent = _tile(
+        {
+            "states": [_feature(mvt._POINT, [[(100, 100)]])],
+            "places": [_feature(mvt._POINT, [[(3000, 3000)]])],
+        }
+    )
+    assert list(_decode(overzoom(parent, 1, 1, 1))) == ["places"]
+    assert (
+        overzoom(_tile({"states": [_feature(mvt._POINT, [[(1, 1)]])]}), 2, 3, 3) == b""
+    )
+
+
+def test_polygon_is_clipped_to_buffer():
+    square = [(0, 0), (4096, 0), (4096, 4096), (0, 4096)]
+    parent = _tile({"states": [_feature(mvt._POLYGON, [square])]})
+    [(_, geom_type, [ring])] = _decode(overzoom(parent, 2, 1, 2))["states"]
+    assert geom_type == mvt._POLYGON
+    assert {x for x, _ in ring} == {-64, 4160}
+    assert {y for _, y in ring} == {-64, 4160}
+
+
+def test_line_leaving_child_is_split():
+    # a U that drops out of the bottom of the top-left child and back in
+    line = [(100, 1000), (100, 3000), (1900, 3000), (1900, 1000)]
+    parent = _tile({"msas": [_feature(mvt._LINESTRING, [line])]})
+    [(_, geom_type, parts)] = _decode(overzoom(parent, 1, 0, 0, buffer=0))["msas"]
+    assert geom_type == mvt._LINESTRING
+    assert parts == [[(200, 2000), (200, 4096)], [(3800, 4096), (3800, 2000)]]
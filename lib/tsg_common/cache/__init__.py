@@ -1,9 +1,10 @@
-from typing import Callable, TypeVar, cast
+from typing import Callable, Iterable, Iterator, TypeVar, cast
 
 import redis
 import orjson
 
 from .settings import settings
+from .compression import ENCODINGS, compress
 
 T = TypeVar("T")
 
@@ -28,6 +29,69 @@ class Cache:
     def set_raw(self, key: str, value: bytes, ttl: int) -> None:
         self.r.setex(key, ttl, value)
 
+    def mget_raw(self, keys: list[str]) -> list[bytes | None]:
+        """Values of `keys` in one round trip, None where missing."""
+        return cast(list[bytes | None], self.r.mget(keys)) if keys else []
+
+    def set_raw_many(self, values: dict[str, bytes], ttl: int) -> None:
+        """`set_raw` for every key in `values`, in one pipeline."""
+        if not values:
+            return
+        pipe = self.r.pipeline(transaction=False)
+        for key, value in values.items():
+            pipe.setex(key, ttl, value)
+        pipe.execute()
+
+    # pre-compressed variants, stored as `{key}:{encoding}` next to the raw key
+    def get_encoded(self, key: str, encoding: str | None) -> bytes | None:
+        """
+        Return the `encoding` variant of `key` (raw bytes when None). A raw
+        entry without that variant is compressed once and backfilled.
+        """
+        if encoding is None:
+            return self.get_raw(key)
+
+        data = self.get_raw(f"{key}:{encoding}")
+        if data is not None:
+            return data
+
+        raw = self.get_raw(key)
+        if raw is None:
+            return None
+        data = compress(raw, encoding)
+        ttl = cast(int, self.r.ttl(key))
+        if ttl > 0:
+            self.set_raw(f"{key}:{encoding}", data, ttl)
+        return data
+
+    def set_encoded(self, key: str, value: bytes, ttl: int) -> dict[str | None, bytes]:
+        """
+        Store `value` plus one compressed copy per supported encoding in a
+        single round trip. Returns every variant keyed by encoding (None = raw).
+        """
+        variants: dict[str | None, bytes] = {None: value}
+        pipe = self.r.pipeline(transaction=False)
+        pipe.setex(key, ttl, value)
+        for enc in ENCODINGS:
+            variants[enc] = compress(value, enc)
+            pipe.setex(f"{key}:{enc}", ttl, variants[enc])
+        pipe.execute()
+        return variants
+
+    # key maintenance
+    def scan(self, match: str, count: int = 1000) -> Iterator[bytes]:
+        """Incrementally iterate keys matching `match` (never blocks Redis)."""
+        return self.r.scan_iter(match=match, count=count)
+
+    def unlink(self, keys: Iterable[bytes | str]) -> int:
+        """Delete `keys` (freed in the background); returns how many existed."""
+        keys = list(keys)
+        return cast(int, self.r.unlink(*keys)) if keys else 0
+
+    # counters, kept as one Redis hash per metric
+    def hincr(self, key: str, field: str, amount: int = 1) -> None:
+        self.r.hincrby(key, field, amount)
+
     # high-level JSON helpers
     def get_json(self, key: str) -> T | None:
         data = self.r.get(key)
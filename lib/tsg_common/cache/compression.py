@@ -0,0 +1,69 @@
+"""
+Content-encoding helpers for payloads that are compressed once, stored in
+Redis next to the raw bytes, and served as-is.
+
+gzip is always available; brotli and zstd are used when their optional
+modules are installed.
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Preferred first when the client accepts several
+ENCODINGS: tuple[str, ...] = tuple(
+    enc
+    for enc, available in (
+        ("br", brotli is not None),
+        ("zstd", zstandard is not None),
+        ("gzip", True),
+    )
+    if available
+)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=9)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def negotiate(
+    accept_encoding: str | None, available: tuple[str, ...] = ENCODINGS
+) -> str | None:
+    """
+    Pick the preferred encoding from `available` that the Accept-Encoding
+    header allows, or None for identity.
+    """
+    if not accept_encoding:
+        return None
+
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+
+    wildcard = accepted.get("*", 0.0)
+    for enc in available:
+        if accepted.get(enc, wildcard) > 0:
+            return enc
+    return None
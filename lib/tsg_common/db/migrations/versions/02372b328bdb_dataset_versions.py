@@ -0,0 +1,38 @@
+"""dataset versions
+
+Revision ID: 02372b328bdb
+Revises: 8e62f1863cdc
+Create Date: 2026-10-18 13:20:51.774012
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "02372b328bdb"
+down_revision: Union[str, None] = "8e62f1863cdc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "dataset_versions",
+        sa.Column("version", sa.Text(), nullable=False),
+        sa.Column(
+            "loaded_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("version", name=op.f("pk_dataset_versions")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("dataset_versions")
@@ -0,0 +1,36 @@
+"""reverse cells
+
+Revision ID: 29427c8b01e5
+Revises: 987718f75a00
+Create Date: 2026-10-18 18:41:07.203512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "29427c8b01e5"
+down_revision: Union[str, None] = "987718f75a00"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "reverse_cells",
+        sa.Column("layer", sa.Text(), nullable=False),
+        sa.Column("zoom", sa.Integer(), nullable=False),
+        sa.Column("cells", sa.LargeBinary(), nullable=False),
+        sa.Column("geoids", postgresql.ARRAY(sa.Text()), nullable=False),
+        sa.PrimaryKeyConstraint("layer", "zoom", name=op.f("pk_reverse_cells")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("reverse_cells")
@@ -0,0 +1,75 @@
+"""subdivided geometries
+
+Revision ID: 4a3dc664dbcf
+Revises: 29427c8b01e5
+Create Date: 2026-10-18 20:16:52.480917
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+# revision identifiers, used by Alembic.
+revision: str = "4a3dc664dbcf"
+down_revision: Union[str, None] = "29427c8b01e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (parent table, geoid length)
+TABLES = (("states", 2), ("counties", 5), ("msas", 5), ("places", 7))
+# keep in sync with SUBDIVIDE_MAX_VERTICES
+MAX_VERTICES = 256
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for parent, geoid_length in TABLES:
+        table = f"{parent}_subdivided"
+        op.create_table(
+            table,
+            sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column("geoid", sa.String(length=geoid_length), nullable=False),
+            sa.Column(
+                "geom",
+                geoalchemy2.types.Geometry(
+                    geometry_type="MULTIPOLYGON",
+                    srid=4326,
+                    from_text="ST_GeomFromEWKT",
+                    name="geometry",
+                    nullable=False,
+                ),
+                nullable=False,
+            ),
+            sa.ForeignKeyConstraint(
+                ["geoid"],
+                [f"{parent}.geoid"],
+                name=op.f(f"fk_{table}_geoid_{parent}"),
+                ondelete="CASCADE",
+            ),
+            sa.PrimaryKeyConstraint("id", name=op.f(f"pk_{table}")),
+        )
+        # Seed from the current rows so containment queries keep working
+        # until the next ETL run rebuilds the pieces.
+        op.execute(
+            f"INSERT INTO {table} (geoid, geom) "
+            f"SELECT geoid, ST_Multi(piece) FROM ("
+            f"SELECT geoid, ST_Subdivide(geom, {MAX_VERTICES}) AS piece "
+            f"FROM {parent}) AS pieces"
+        )
+        op.create_index(
+            f"ix_{table}_geom_gix",
+            table,
+            ["geom"],
+            unique=False,
+            postgresql_using="gist",
+        )
+        op.create_index(f"ix_{table}_geoid", table, ["geoid"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for parent, _ in TABLES:
+        op.drop_table(f"{parent}_subdivided")
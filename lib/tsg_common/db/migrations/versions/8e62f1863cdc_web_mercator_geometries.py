@@ -0,0 +1,69 @@
+"""web mercator geometries
+
+Revision ID: 8e62f1863cdc
+Revises: 9403f0262e64
+Create Date: 2026-10-18 11:47:05.602194
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+# revision identifiers, used by Alembic.
+revision: str = "8e62f1863cdc"
+down_revision: Union[str, None] = "9403f0262e64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("states", "counties", "msas", "places")
+GENERALIZED_COLUMNS = ("geom_z4", "geom_z7", "geom_z10")
+
+
+def _alter_srid(table: str, column: str, srid: int) -> None:
+    op.execute(
+        f"ALTER TABLE {table} ALTER COLUMN {column} "
+        f"TYPE geometry(MULTIPOLYGON, {srid}) USING ST_Transform({column}, {srid})"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "geom_3857",
+                geoalchemy2.types.Geometry(
+                    geometry_type="MULTIPOLYGON",
+                    srid=3857,
+                    from_text="ST_GeomFromEWKT",
+                    name="geometry",
+                ),
+                sa.Computed("ST_Transform(geom, 3857)", persisted=True),
+                nullable=True,
+            ),
+        )
+        op.create_index(
+            f"ix_{table}_geom_3857_gix",
+            table,
+            ["geom_3857"],
+            unique=False,
+            postgresql_using="gist",
+        )
+        # generalised levels are only read by tile rendering
+        for column in GENERALIZED_COLUMNS:
+            _alter_srid(table, column, 3857)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        for column in GENERALIZED_COLUMNS:
+            _alter_srid(table, column, 4326)
+        op.drop_index(
+            f"ix_{table}_geom_3857_gix", table_name=table, postgresql_using="gist"
+        )
+        op.drop_column(table, "geom_3857")
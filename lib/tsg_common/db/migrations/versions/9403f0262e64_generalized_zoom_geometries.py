@@ -0,0 +1,67 @@
+"""generalized zoom geometries
+
+Revision ID: 9403f0262e64
+Revises: a25bcebac98f
+Create Date: 2026-10-18 09:12:40.118305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+# revision identifiers, used by Alembic.
+revision: str = "9403f0262e64"
+down_revision: Union[str, None] = "a25bcebac98f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("states", "counties", "msas", "places")
+# (column, tolerance in degrees) as first created. Historical: migration
+# 8e62f1863cdc redefines these columns on geom_3857 with the metre
+# tolerances in GENERALIZED_LEVELS, so do not sync the two.
+LEVELS = (("geom_z4", 0.005), ("geom_z7", 0.0007), ("geom_z10", 0.0001))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        for column, tolerance in LEVELS:
+            op.add_column(
+                table,
+                sa.Column(
+                    column,
+                    geoalchemy2.types.Geometry(
+                        geometry_type="MULTIPOLYGON",
+                        srid=4326,
+                        from_text="ST_GeomFromEWKT",
+                        name="geometry",
+                    ),
+                    nullable=True,
+                ),
+            )
+            # Seed with a grid snap so tiles keep rendering until the next
+            # ETL run rebuilds the levels with coverage simplification.
+            op.execute(
+                f"UPDATE {table} SET {column} = ST_Multi(ST_CollectionExtract("
+                f"ST_MakeValid(ST_SnapToGrid(geom, {tolerance})), 3))"
+            )
+            op.create_index(
+                f"ix_{table}_{column}_gix",
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gist",
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        for column, _ in LEVELS:
+            op.drop_index(
+                f"ix_{table}_{column}_gix", table_name=table, postgresql_using="gist"
+            )
+            op.drop_column(table, column)
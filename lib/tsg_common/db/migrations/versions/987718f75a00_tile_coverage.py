@@ -0,0 +1,34 @@
+"""tile coverage
+
+Revision ID: 987718f75a00
+Revises: 02372b328bdb
+Create Date: 2026-10-18 15:02:33.418760
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "987718f75a00"
+down_revision: Union[str, None] = "02372b328bdb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tile_coverage",
+        sa.Column("layer", sa.Text(), nullable=False),
+        sa.Column("zoom", sa.Integer(), nullable=False),
+        sa.Column("tiles", sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint("layer", "zoom", name=op.f("pk_tile_coverage")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("tile_coverage")
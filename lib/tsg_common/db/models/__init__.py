@@ -4,7 +4,20 @@ from .county import County
 from .msa import MSA
 from .place import Place
 from .quickfacts import QuickFacts
-from .base_geo import BaseGeo
+from .dataset_version import DatasetVersion
+from .tile_coverage import TileCoverage
+from .reverse_cells import ReverseCells
+from .geocode_job import GeocodeJob
+from .base_geo import BaseGeo, TileGeo, GENERALIZED_LEVELS
+from .subdivided import (
+    SubdividedGeo,
+    StateSubdivided,
+    CountySubdivided,
+    MSASubdivided,
+    PlaceSubdivided,
+    SUBDIVIDED_MODELS,
+    SUBDIVIDE_MAX_VERTICES,
+)
 
 __all__ = [
     "International",
@@ -13,5 +26,18 @@ __all__ = [
     "MSA",
     "Place",
     "QuickFacts",
+    "DatasetVersion",
+    "TileCoverage",
+    "ReverseCells",
+    "GeocodeJob",
     "BaseGeo",
+    "TileGeo",
+    "GENERALIZED_LEVELS",
+    "SubdividedGeo",
+    "StateSubdivided",
+    "CountySubdivided",
+    "MSASubdivided",
+    "PlaceSubdivided",
+    "SUBDIVIDED_MODELS",
+    "SUBDIVIDE_MAX_VERTICES",
 ]
@@ -1,16 +1,46 @@
-from sqlalchemy import Column
+from sqlalchemy import Column, Computed
 from geoalchemy2 import Geometry
 
 from ..base import Base
 
+# Zoom bands served from pre-generalised geometry, coarsest first:
+# (highest zoom served, column name, simplification tolerance in metres).
+# Tolerances are roughly one 4096-extent tile unit at the band's top zoom.
+GENERALIZED_LEVELS: tuple[tuple[int, str, float], ...] = (
+    (4, "geom_z4", 600.0),
+    (7, "geom_z7", 75.0),
+    (10, "geom_z10", 10.0),
+)
+
 
 class BaseGeo(Base):
     """Base class for all geographic models.
 
     This class provides the basic geometric column that is shared
-    across all geographic models.
+    across all geographic models, plus a persisted Web-Mercator copy so
+    tile rendering never reprojects on the fly.
     """
 
     __abstract__ = True
 
     geom = Column(Geometry("MULTIPOLYGON", srid=4326), nullable=False)
+
+    geom_3857 = Column(
+        Geometry("MULTIPOLYGON", srid=3857),
+        Computed("ST_Transform(geom, 3857)", persisted=True),
+    )
+
+
+class TileGeo(BaseGeo):
+    """Base class for layers served as vector tiles.
+
+    Adds one generalised copy of `geom_3857` per zoom band in GENERALIZED_LEVELS.
+    These are rebuilt by the ETL (see WriteQueries.refresh_generalized) so
+    low-zoom tiles never read full-resolution TIGER vertices.
+    """
+
+    __abstract__ = True
+
+    geom_z4 = Column(Geometry("MULTIPOLYGON", srid=3857), nullable=True)
+    geom_z7 = Column(Geometry("MULTIPOLYGON", srid=3857), nullable=True)
+    geom_z10 = Column(Geometry("MULTIPOLYGON", srid=3857), nullable=True)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Text, DateTime
+from sqlalchemy.sql import func
+
+from ..base import Base
+
+
+class DatasetVersion(Base):
+    """One row per completed ETL load; the newest row is the live dataset."""
+
+    __tablename__ = "dataset_versions"
+
+    version = Column(Text, primary_key=True, doc="Opaque load identifier")
+    loaded_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        doc="When the ETL finished writing this load",
+    )
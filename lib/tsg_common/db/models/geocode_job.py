@@ -0,0 +1,43 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, Text
+from sqlalchemy.sql import func
+
+from ..base import Base
+
+
+class GeocodeJob(Base):
+    """One bulk geocoding request over an S3 file; rows are the job queue."""
+
+    __tablename__ = "geocode_jobs"
+
+    id = Column(Text, primary_key=True, doc="Opaque job id")
+    status = Column(
+        Text,
+        nullable=False,
+        server_default="queued",
+        doc="queued | running | succeeded | failed",
+    )
+    input_key = Column(Text, nullable=False, doc="S3 key of the input file")
+    format = Column(Text, nullable=False, doc="csv | parquet")
+    lat_column = Column(Text, nullable=False)
+    lon_column = Column(Text, nullable=False)
+    output_key = Column(Text, nullable=True, doc="S3 key of the enriched file")
+    rows_done = Column(BigInteger, nullable=False, server_default="0")
+    error = Column(Text, nullable=True)
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="Last sign of life from the worker running the job",
+    )
+    attempts = Column(
+        Integer, nullable=False, server_default="0", doc="Times the job was claimed"
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # workers claim the oldest queued job
+        Index("ix_geocode_jobs_status_created_at", "status", "created_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, String, Text, Index
 
 from .base_geo import BaseGeo
 
@@ -12,3 +12,8 @@ class International(BaseGeo):
         String(2), primary_key=True, doc="Static 00 code, only single country"
     )
     name = Column(Text, nullable=False)
+
+    # Define spatial index for the Web-Mercator geometry column
+    __table_args__ = (
+        Index("ix_international_geom_3857_gix", "geom_3857", postgresql_using="gist"),
+    )
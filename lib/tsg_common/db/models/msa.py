@@ -1,9 +1,9 @@
 from sqlalchemy import Column, String, Text, Index
 
-from .base_geo import BaseGeo
+from .base_geo import TileGeo
 
 
-class MSA(BaseGeo):
+class MSA(TileGeo):
     """Metropolitan Statistical Area model."""
 
     __tablename__ = "msas"
@@ -12,4 +12,11 @@ class MSA(BaseGeo):
     name = Column(Text, nullable=False)
 
     # Define spatial index for the geometry column
-    __table_args__ = (Index("ix_msas_geom_gix", "geom", postgresql_using="gist"),)
+    __table_args__ = (
+        Index("ix_msas_geom_gix", "geom", postgresql_using="gist"),
+        Index("ix_msas_geom_3857_gix", "geom_3857", postgresql_using="gist"),
+        # spatial indexes for the generalised zoom-band geometries
+        Index("ix_msas_geom_z4_gix", "geom_z4", postgresql_using="gist"),
+        Index("ix_msas_geom_z7_gix", "geom_z7", postgresql_using="gist"),
+        Index("ix_msas_geom_z10_gix", "geom_z10", postgresql_using="gist"),
+    )
@@ -2,10 +2,10 @@ from sqlalchemy import Column, String, Text, Computed, Index, ForeignKey
 from geoalchemy2 import Geometry
 from sqlalchemy.sql import text
 
-from .base_geo import BaseGeo
+from .base_geo import TileGeo
 
 
-class Place(BaseGeo):
+class Place(TileGeo):
     """Place model representing cities and towns."""
 
     __tablename__ = "places"
@@ -24,6 +24,12 @@ class Place(BaseGeo):
     __table_args__ = (
         # spatial index for the geometry column
         Index("ix_places_geom_gix", "geom", postgresql_using="gist"),
+        # Web-Mercator copy used by tile rendering
+        Index("ix_places_geom_3857_gix", "geom_3857", postgresql_using="gist"),
+        # spatial indexes for the generalised zoom-band geometries
+        Index("ix_places_geom_z4_gix", "geom_z4", postgresql_using="gist"),
+        Index("ix_places_geom_z7_gix", "geom_z7", postgresql_using="gist"),
+        Index("ix_places_geom_z10_gix", "geom_z10", postgresql_using="gist"),
         # spatial index on centroid for fast point-radius search
         Index("ix_places_centroid_gix", "centroid", postgresql_using="gist"),
         # functional geography index to avoid run-time casts in distance calculations
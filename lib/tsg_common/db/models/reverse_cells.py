@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Text, LargeBinary
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from ..base import Base
+
+
+class ReverseCells(Base):
+    """
+    Web-Mercator grid cells lying wholly inside one polygon of a reverse
+    layer, per zoom: a point in such a cell needs no polygon test.
+    """
+
+    __tablename__ = "reverse_cells"
+
+    layer = Column(Text, primary_key=True, doc="Reverse layer name")
+    zoom = Column(Integer, primary_key=True, doc="Zoom level of the cells")
+    cells = Column(
+        LargeBinary, nullable=False, doc="Sorted little-endian uint64 tile codes"
+    )
+    geoids = Column(
+        ARRAY(Text), nullable=False, doc="Containing geoid of each cell, in order"
+    )
@@ -1,9 +1,9 @@
 from sqlalchemy import Column, String, Text, Index
 
-from .base_geo import BaseGeo
+from .base_geo import TileGeo
 
 
-class State(BaseGeo):
+class State(TileGeo):
     """State model representing US states with geometry data."""
 
     __tablename__ = "states"
@@ -12,4 +12,11 @@ class State(BaseGeo):
     name = Column(Text, nullable=False)
 
     # Define spatial index for the geometry column
-    __table_args__ = (Index("ix_states_geom_gix", "geom", postgresql_using="gist"),)
+    __table_args__ = (
+        Index("ix_states_geom_gix", "geom", postgresql_using="gist"),
+        Index("ix_states_geom_3857_gix", "geom_3857", postgresql_using="gist"),
+        # spatial indexes for the generalised zoom-band geometries
+        Index("ix_states_geom_z4_gix", "geom_z4", postgresql_using="gist"),
+        Index("ix_states_geom_z7_gix", "geom_z7", postgresql_using="gist"),
+        Index("ix_states_geom_z10_gix", "geom_z10", postgresql_using="gist"),
+    )
@@ -0,0 +1,83 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from geoalchemy2 import Geometry
+
+from ..base import Base
+
+# ST_Subdivide vertex cap for the *_subdivided tables
+SUBDIVIDE_MAX_VERTICES = 256
+
+
+class SubdividedGeo(Base):
+    """Base class for the ST_Subdivide pieces of a polygon layer.
+
+    Each piece has at most SUBDIVIDE_MAX_VERTICES vertices and a tight bbox,
+    so GiST prunes to a handful of small pieces and the exact test stays
+    cheap even for coastal counties. Rebuilt by the ETL (see
+    WriteQueries.refresh_subdivided).
+    """
+
+    __abstract__ = True
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    geom = Column(Geometry("MULTIPOLYGON", srid=4326), nullable=False)
+
+
+class StateSubdivided(SubdividedGeo):
+    __tablename__ = "states_subdivided"
+
+    geoid = Column(
+        String(2), ForeignKey("states.geoid", ondelete="CASCADE"), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_states_subdivided_geom_gix", "geom", postgresql_using="gist"),
+        Index("ix_states_subdivided_geoid", "geoid"),
+    )
+
+
+class CountySubdivided(SubdividedGeo):
+    __tablename__ = "counties_subdivided"
+
+    geoid = Column(
+        String(5), ForeignKey("counties.geoid", ondelete="CASCADE"), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_counties_subdivided_geom_gix", "geom", postgresql_using="gist"),
+        Index("ix_counties_subdivided_geoid", "geoid"),
+    )
+
+
+class MSASubdivided(SubdividedGeo):
+    __tablename__ = "msas_subdivided"
+
+    geoid = Column(
+        String(5), ForeignKey("msas.geoid", ondelete="CASCADE"), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_msas_subdivided_geom_gix", "geom", postgresql_using="gist"),
+        Index("ix_msas_subdivided_geoid", "geoid"),
+    )
+
+
+class PlaceSubdivided(SubdividedGeo):
+    __tablename__ = "places_subdivided"
+
+    geoid = Column(
+        String(7), ForeignKey("places.geoid", ondelete="CASCADE"), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_places_subdivided_geom_gix", "geom", postgresql_using="gist"),
+        Index("ix_places_subdivided_geoid", "geoid"),
+    )
+
+
+# Pieces table of each subdivided layer, keyed by the parent's table name
+SUBDIVIDED_MODELS: dict[str, type[SubdividedGeo]] = {
+    "states": StateSubdivided,
+    "counties": CountySubdivided,
+    "msas": MSASubdivided,
+    "places": PlaceSubdivided,
+}
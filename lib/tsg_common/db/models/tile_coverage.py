@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, Text, LargeBinary
+
+from ..base import Base
+
+
+class TileCoverage(Base):
+    """Packed non-empty tile codes per layer and zoom (see tsg_common.tiles)."""
+
+    __tablename__ = "tile_coverage"
+
+    layer = Column(Text, primary_key=True, doc="Tile layer name")
+    zoom = Column(Integer, primary_key=True, doc="Zoom level of the codes")
+    tiles = Column(
+        LargeBinary, nullable=False, doc="Sorted little-endian uint64 tile codes"
+    )
@@ -1,17 +1,82 @@
 from sqlalchemy import (
+    bindparam,
     select,
     func,
+    case,
+    column,
+    values,
+    Float,
+    Integer,
+    literal,
     Select,
+    CTE,
+    LargeBinary,
+    Text,
     text,
     true,
+    or_,
+    tuple_,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
 from typing import Sequence
 from geoalchemy2 import functions as gf
 from geoalchemy2.types import Geography
 from sqlalchemy.engine import RowMapping
 
-from .models import Place, County, MSA, QuickFacts, State
+from .models import (
+    Place,
+    County,
+    MSA,
+    QuickFacts,
+    State,
+    DatasetVersion,
+    TileCoverage,
+    ReverseCells,
+    GeocodeJob,
+    GENERALIZED_LEVELS,
+    SUBDIVIDED_MODELS,
+)
+
+# Plain `::geography` (no typmod) so casts of Place.centroid match the
+# ix_places_centroid_geog_gix expression and can use it
+GEOGRAPHY = Geography(geometry_type=None)
+
+# Layers that can be rendered as tiles, keyed by their public name
+TILE_MODELS = {
+    "states": State,
+    "counties": County,
+    "msas": MSA,
+    "places": Place,
+}
+
+# Layers /v1/reverse can resolve, outermost first: public name ->
+# (response key, model)
+REVERSE_MODELS = {
+    "states": ("state", State),
+    "counties": ("county", County),
+    "msas": ("msa", MSA),
+    "places": ("place", Place),
+}
+
+# Below this zoom the places layer is thinned to grid-clustered centroid
+# points carrying a `point_count`; from it upwards full polygons are drawn
+PLACES_POLYGON_MIN_ZOOM = 8
+# Cluster grid cells per tile side (64 cells = 64px at 4096 extent)
+CLUSTER_GRID_CELLS = 64
+
+
+def generalized_column(z: int, simplify: int = 0) -> str:
+    """
+    Web-Mercator geometry column to render zoom `z` from. `simplify` shifts
+    the choice that many zoom levels coarser; past the last band the
+    full-resolution `geom_3857` is used.
+    """
+    zoom = z - simplify
+    for max_zoom, column, _ in GENERALIZED_LEVELS:
+        if zoom <= max_zoom:
+            return column
+    return "geom_3857"
 
 
 class ReadQueries:
@@ -27,21 +92,21 @@ class ReadQueries:
         Return `limit` places whose centroid is within `radius_km`.
         Distance is returned in *kilometres* for direct JSON serialise.
         """
-        pt_geog = gf.ST_SetSRID(gf.ST_MakePoint(lon, lat), 4326).cast(Geography)
+        pt_geog = gf.ST_SetSRID(gf.ST_MakePoint(lon, lat), 4326).cast(GEOGRAPHY)
 
         q = (
             select(
                 Place.geoid.label("geoid"),
                 Place.name.label("name"),
                 (
-                    func.ST_Distance(Place.centroid.cast(Geography), pt_geog) / 1000.0
+                    func.ST_Distance(Place.centroid.cast(GEOGRAPHY), pt_geog) / 1000.0
                 ).label("distance_km"),
                 func.ST_Y(Place.centroid).label("lat"),
                 func.ST_X(Place.centroid).label("lon"),
             )
             .where(
                 gf.ST_DWithin(
-                    Place.centroid.cast(Geography),
+                    Place.centroid.cast(GEOGRAPHY),
                     pt_geog,
                     radius_km * 1000,
                 )
@@ -52,31 +117,217 @@ class ReadQueries:
 
         return self.db.execute(q).mappings().all()
 
-    def reverse_lookup(
-        self, lat: float, lon: float, layers: tuple[str, ...] = ("counties", "msas")
-    ) -> dict:
+    def nearest_places(
+        self,
+        lat: float,
+        lon: float,
+        limit: int = 25,
+        radius_km: float | None = None,
+    ) -> Sequence[RowMapping]:
         """
-        Return the county and/or MSA whose polygon contains the point.
-        Omits keys not requested in `layers`.
+        The `limit` places nearest to the point, optionally within
+        `radius_km`. Candidates come from an index-assisted KNN scan
+        (`<->` on ix_places_centroid_geog_gix), so cost is bounded by
+        `limit` however dense the area; they are then re-ranked by exact
+        spheroidal ST_Distance, in kilometres.
         """
+        pt_geog = gf.ST_SetSRID(gf.ST_MakePoint(lon, lat), 4326).cast(GEOGRAPHY)
+        centroid_geog = Place.centroid.cast(GEOGRAPHY)
 
-        pt = gf.ST_SetSRID(gf.ST_MakePoint(lon, lat), 4326)
+        candidates = select(Place.geoid, Place.name, Place.centroid)
+        if radius_km is not None:
+            candidates = candidates.where(
+                gf.ST_DWithin(centroid_geog, pt_geog, radius_km * 1000)
+            )
+        # `<->` on geography is a sphere distance; over-fetch so the
+        # spheroidal re-rank below cannot miss a near tie
+        candidates_sq = (
+            candidates.order_by(centroid_geog.op("<->")(pt_geog))
+            .limit(limit * 2)
+            .subquery("candidates")
+        )
 
-        out: dict = {}
-        if "counties" in layers:
-            county = self.db.scalar(
-                select(County).where(gf.ST_Contains(County.geom, pt)).limit(1)
+        centroid = candidates_sq.c.centroid
+        q = (
+            select(
+                candidates_sq.c.geoid.label("geoid"),
+                candidates_sq.c.name.label("name"),
+                (func.ST_Distance(centroid.cast(GEOGRAPHY), pt_geog) / 1000.0).label(
+                    "distance_km"
+                ),
+                func.ST_Y(centroid).label("lat"),
+                func.ST_X(centroid).label("lon"),
             )
-            out["county"] = county
+            .order_by("distance_km")
+            .limit(limit)
+        )
+        return self.db.execute(q).mappings().all()
+
+    def nearest_places_many(
+        self,
+        points: Sequence[tuple[float, float]],
+        limit: int = 25,
+        radius_km: float | None = None,
+        knn: bool = True,
+    ) -> list[list[RowMapping]]:
+        """
+        `nearest_places` (knn) or `nearby_places` for every (lat, lon) in one
+        statement: the points go in as a VALUES list and each runs the
+        per-point query as a LATERAL subquery. Results are index-aligned
+        with `points`.
+        """
+        if not points:
+            return []
+
+        pts = values(
+            column("idx", Integer),
+            column("lat", Float),
+            column("lon", Float),
+            name="pts",
+        ).data([(i, lat, lon) for i, (lat, lon) in enumerate(points)])
+        pt_geog = gf.ST_SetSRID(gf.ST_MakePoint(pts.c.lon, pts.c.lat), 4326).cast(
+            GEOGRAPHY
+        )
+        centroid_geog = Place.centroid.cast(GEOGRAPHY)
+        distance_km = func.ST_Distance(centroid_geog, pt_geog) / 1000.0
 
-        if "msas" in layers:
-            msa = self.db.scalar(
-                select(MSA).where(gf.ST_Contains(MSA.geom, pt)).limit(1)
+        near = select(
+            Place.geoid.label("geoid"),
+            Place.name.label("name"),
+            distance_km.label("distance_km"),
+            func.ST_Y(Place.centroid).label("lat"),
+            func.ST_X(Place.centroid).label("lon"),
+        )
+        if radius_km is not None:
+            near = near.where(gf.ST_DWithin(centroid_geog, pt_geog, radius_km * 1000))
+        if knn:
+            # same over-fetch as `nearest_places`; trimmed after the re-rank
+            near = near.order_by(centroid_geog.op("<->")(pt_geog)).limit(limit * 2)
+        else:
+            near = near.order_by(distance_km).limit(limit)
+        near_lat = near.lateral("near")
+
+        q = (
+            select(
+                pts.c.idx,
+                near_lat.c.geoid,
+                near_lat.c.name,
+                near_lat.c.distance_km,
+                near_lat.c.lat,
+                near_lat.c.lon,
             )
-            out["msa"] = msa
+            .select_from(pts.join(near_lat, true()))
+            .order_by(pts.c.idx, near_lat.c.distance_km)
+        )
 
+        out: list[list[RowMapping]] = [[] for _ in points]
+        for row in self.db.execute(q).mappings():
+            if len(out[row["idx"]]) < limit:
+                out[row["idx"]].append(row)
         return out
 
+    def place_points(self) -> Sequence[RowMapping]:
+        """Every place centroid as {geoid, name, lat, lon}, for in-memory indexes."""
+        q = select(
+            Place.geoid.label("geoid"),
+            Place.name.label("name"),
+            func.ST_Y(Place.centroid).label("lat"),
+            func.ST_X(Place.centroid).label("lon"),
+        )
+        return self.db.execute(q).mappings().all()
+
+    def reverse_lookup(
+        self, lat: float, lon: float, layers: tuple[str, ...] = ("counties", "msas")
+    ) -> dict[str, dict | None]:
+        """
+        Return {geoid, name} of the state, county, MSA and/or place whose
+        polygon contains the point, keyed "state" / "county" / "msa" /
+        "place", in one round trip. Omits keys not requested in `layers`.
+        """
+        return self.reverse_lookup_many([(lat, lon)], layers)[0]
+
+    def reverse_lookup_many(
+        self, points: Sequence[tuple[float, float]], layers: tuple[str, ...]
+    ) -> list[dict[str, dict | None]]:
+        """
+        `reverse_lookup` for every (lat, lon) in one statement: the points go
+        in as two unnested float8 arrays and each layer is a LEFT JOIN
+        LATERAL containment probe. Results are index-aligned with `points`.
+        """
+        if not len(points):
+            return []
+
+        lats = [float(lat) for lat, _ in points]
+        lons = [float(lon) for _, lon in points]
+        pts = func.unnest(
+            bindparam("lats", lats, type_=ARRAY(Float)),
+            bindparam("lons", lons, type_=ARRAY(Float)),
+        ).table_valued("lat", "lon", with_ordinality="idx").render_derived("pts")
+        pt = gf.ST_SetSRID(gf.ST_MakePoint(pts.c.lon, pts.c.lat), 4326)
+
+        keys = []
+        cols = [pts.c.idx]
+        from_ = pts
+        for layer, (key, model) in REVERSE_MODELS.items():
+            if layer not in layers:
+                continue
+            keys.append(key)
+            # probe the small subdivided pieces, not the whole polygon, with
+            # ST_Contains semantics like the in-memory indexes: a point on the
+            # polygon's boundary matches nothing. One on a cut line between
+            # two pieces is inside neither, so it falls back to the whole
+            # polygon (the only case that reads it).
+            pieces = SUBDIVIDED_MODELS[layer]
+            hit = (
+                select(model.geoid, model.name)
+                .join(pieces, pieces.geoid == model.geoid)
+                .where(
+                    gf.ST_Intersects(pieces.geom, pt),
+                    or_(
+                        gf.ST_Contains(pieces.geom, pt),
+                        gf.ST_Contains(model.geom, pt),
+                    ),
+                )
+                .limit(1)
+                .lateral(key)
+            )
+            from_ = from_.outerjoin(hit, true())
+            cols += [hit.c.geoid.label(f"{key}_geoid"), hit.c.name.label(f"{key}_name")]
+
+        q = select(*cols).select_from(from_).order_by(pts.c.idx)
+        return [
+            {
+                key: (
+                    None
+                    if row[f"{key}_geoid"] is None
+                    else {"geoid": row[f"{key}_geoid"], "name": row[f"{key}_name"]}
+                )
+                for key in keys
+            }
+            for row in self.db.execute(q).mappings()
+        ]
+
+    def layer_polygons(
+        self, layer: str, mercator: bool = False
+    ) -> Sequence[RowMapping]:
+        """
+        Every polygon of a reverse-geocoding layer as {geoid, name, wkb}, in
+        EPSG:4326 (or 3857 with `mercator`), for in-memory indexes.
+        """
+        _, model = REVERSE_MODELS[layer]
+        geom = model.geom_3857 if mercator else model.geom
+        q = select(
+            model.geoid.label("geoid"),
+            model.name.label("name"),
+            func.ST_AsBinary(geom).label("wkb"),
+        )
+        return self.db.execute(q).mappings().all()
+
+    def layer_names(self, layer: str) -> dict[str, str]:
+        """geoid -> name for every row of a reverse-geocoding layer."""
+        _, model = REVERSE_MODELS[layer]
+        return dict(self.db.execute(select(model.geoid, model.name)).tuples())
+
     def get_quickfacts(self, layer: str, geoid: str) -> dict | None:
         """
         Fetch the JSONB QuickFacts blob for any layer/geoid pair.
@@ -90,44 +341,143 @@ class ReadQueries:
         res = self.db.scalar(stmt)
         return res
 
-    def tile_data(
-        self, layer: str, z: int, x: int, y: int, format: str = "mvt"
-    ) -> bytes | str | None:
+    def get_quickfacts_many(
+        self, pairs: Sequence[tuple[str, str]]
+    ) -> dict[tuple[str, str], dict]:
         """
-        Returns a Mapbox vector tile (bytes) when fmt='mvt', or GeoJSON str.
+        QuickFacts blobs for many (layer, geoid) pairs in one primary-key
+        `WHERE (layer, geoid) IN (...)` query; unknown pairs are left out.
         """
+        if not pairs:
+            return {}
+        stmt = select(QuickFacts.layer, QuickFacts.geoid, QuickFacts.facts).where(
+            tuple_(QuickFacts.layer, QuickFacts.geoid).in_(list(pairs))
+        )
+        return {(layer, geoid): facts for layer, geoid, facts in self.db.execute(stmt)}
 
-        MODEL = {
-            "states": State,
-            "counties": County,
-            "msas": MSA,
-            "places": Place,
-        }[layer].__table__
+    def _tile_bbox_cte(self, z: int, x: int, y: int, name: str = "bbox") -> CTE:
+        return select(func.ST_TileEnvelope(z, x, y).label("geom_3857")).cte(name)
 
-        # 1️⃣  bbox of the tile in WGS-84
-        bbox_cte = select(
-            func.ST_Transform(
-                func.ST_TileEnvelope(z, x, y),
-                4326,
-            ).label("geom_4326")
-        ).cte("bbox")
+    def _mvt_rows_cte(
+        self,
+        layer: str,
+        bbox_cte: CTE,
+        z: int,
+        simplify: int,
+        name: str,
+        extent: int = 4096,
+        facts: Sequence[str] = (),
+    ) -> CTE:
+        """
+        Rows of one layer inside the tile, geometry already in tile space.
+        Each of `facts` becomes a text property read from the row's
+        QuickFacts blob (absent when the blob has no such field). They travel
+        as the keys of one jsonb column, which ST_AsMVT expands into
+        properties, since column aliases would be cut to Postgres' 63-byte
+        identifier limit and many QuickFacts names are longer.
+        """
+        if layer == "places" and z - simplify < PLACES_POLYGON_MIN_ZOOM:
+            return self._place_clusters_cte(bbox_cte, name, extent)
 
-        # 2️⃣  per-row geometry clipped & simplified for MVT
-        mvt_rows_cte = (
+        MODEL = TILE_MODELS[layer].__table__
+        geom_col = MODEL.c[generalized_column(z, simplify)]
+
+        source = MODEL.join(bbox_cte, true())  # cross-join bbox
+        properties = []
+        if facts:
+            source = source.outerjoin(
+                QuickFacts,
+                (QuickFacts.layer == layer) & (QuickFacts.geoid == MODEL.c.geoid),
+            )
+            pairs = []
+            for fact in facts:
+                pairs += [literal(fact, Text), QuickFacts.facts[fact].astext]
+            properties.append(
+                func.jsonb_strip_nulls(func.jsonb_build_object(*pairs)).label("facts")
+            )
+
+        return (
             select(
                 MODEL.c.geoid,
                 MODEL.c.name,
+                *properties,
                 func.ST_AsMVTGeom(
-                    MODEL.c.geom,
-                    bbox_cte.c.geom_4326,
-                    4096,  # extent
-                    256,  # buffer
+                    geom_col,
+                    bbox_cte.c.geom_3857,
+                    extent,
+                    extent // 16,  # buffer
                     True,  # clip
                 ).label("geom"),
             )
-            .select_from(MODEL.join(bbox_cte, true()))  # cross-join bbox
-            .where(MODEL.c.geom.op("&&")(bbox_cte.c.geom_4326))
-        ).cte("mvt_rows")
+            .select_from(source)
+            .where(geom_col.op("&&")(bbox_cte.c.geom_3857))
+        ).cte(name)
+
+    def _place_clusters_cte(self, bbox_cte: CTE, name: str, extent: int) -> CTE:
+        """
+        Place centroids inside the tile snapped to a CLUSTER_GRID_CELLS grid,
+        one point per occupied cell. `geoid` / `name` are only set for
+        single-place cells.
+        """
+        bbox = select(bbox_cte.c.geom_3857).scalar_subquery()
+        cell_size = (func.ST_XMax(bbox) - func.ST_XMin(bbox)) / CLUSTER_GRID_CELLS
+        point = func.ST_Transform(Place.centroid, 3857)
+
+        points = (
+            select(
+                Place.geoid,
+                Place.name,
+                point.label("pt"),
+                func.ST_SnapToGrid(point, cell_size).label("cell"),
+            )
+            # centroid is stored in 4326, so compare there to use its index
+            .where(Place.centroid.op("&&")(func.ST_Transform(bbox, 4326)))
+            .subquery("place_points")
+        )
+
+        n = func.count()
+        return (
+            select(
+                case((n == 1, func.min(points.c.geoid))).label("geoid"),
+                case((n == 1, func.min(points.c.name))).label("name"),
+                n.label("point_count"),
+                func.ST_AsMVTGeom(
+                    func.ST_Centroid(func.ST_Collect(points.c.pt)),
+                    bbox,
+                    extent,
+                    extent // 16,  # buffer
+                    True,  # clip
+                ).label("geom"),
+            ).group_by(points.c.cell)
+        ).cte(name)
+
+    def tile_data(
+        self,
+        layer: str,
+        z: int,
+        x: int,
+        y: int,
+        format: str = "mvt",
+        simplify: int = 0,
+        extent: int = 4096,
+        facts: Sequence[str] = (),
+    ) -> bytes | str | None:
+        """
+        Returns a Mapbox vector tile (bytes) when fmt='mvt', or GeoJSON str.
+        Geometry comes from the generalised column for `z` (see
+        `generalized_column`), so low zooms never touch full-res vertices;
+        places below PLACES_POLYGON_MIN_ZOOM come back as clustered points.
+        A smaller `extent` trades coordinate precision for bytes; `facts`
+        adds those QuickFacts fields as feature properties.
+        """
+
+        # 1️⃣  bbox of the tile in Web-Mercator, same SRID as the stored geometry
+        bbox_cte = self._tile_bbox_cte(z, x, y)
+
+        # 2️⃣  per-row geometry clipped & simplified for MVT
+        mvt_rows_cte = self._mvt_rows_cte(
+            layer, bbox_cte, z, simplify, "mvt_rows", extent, facts
+        )
 
         # 3️⃣  choose output format
         if format == "mvt":
@@ -136,7 +486,7 @@ class ReadQueries:
                 func.ST_AsMVT(
                     text("mvt_rows.*"),  # row-set Arg1
                     "layer",
-                    4096,
+                    extent,
                     "geom",
                 )
             ).select_from(mvt_rows_cte)
@@ -149,6 +499,142 @@ class ReadQueries:
             )
             return self.db.scalar(gj_stmt)
 
+    def composite_tile_data(
+        self,
+        layers: Sequence[str],
+        z: int,
+        x: int,
+        y: int,
+        simplify: int = 0,
+        extent: int = 4096,
+        facts: Sequence[str] = (),
+    ) -> bytes | None:
+        """
+        One MVT holding a named MVT layer per entry of `layers`, rendered in a
+        single statement by concatenating each layer's ST_AsMVT output.
+        """
+        result = self.db.scalar(
+            select(self._mvt_expr(layers, z, x, y, simplify, extent, facts))
+        )
+        return bytes(result) if result else None
+
+    def batch_tile_data(
+        self,
+        tiles: Sequence[tuple[Sequence[str], int, int, int]],
+        simplify: int = 0,
+        facts: Sequence[str] = (),
+    ) -> list[bytes | None]:
+        """
+        Render many (layers, z, x, y) mvt tiles in one statement, one output
+        column per tile; same output as `tile_data` / `composite_tile_data`.
+        """
+        if not tiles:
+            return []
+        columns = [
+            self._mvt_expr(
+                layers, z, x, y, simplify, 4096, facts, prefix=f"t{i}_"
+            ).label(f"t{i}")
+            for i, (layers, z, x, y) in enumerate(tiles)
+        ]
+        row = self.db.execute(select(*columns)).one()
+        return [bytes(tile) if tile else None for tile in row]
+
+    def _mvt_expr(
+        self,
+        layers: Sequence[str],
+        z: int,
+        x: int,
+        y: int,
+        simplify: int,
+        extent: int,
+        facts: Sequence[str] = (),
+        prefix: str = "",
+    ):
+        """
+        Scalar expression rendering one tile as the concatenated ST_AsMVT
+        output of each layer; a lone layer keeps the MVT layer name "layer".
+        CTE names carry `prefix` so several tiles can share a statement.
+        """
+        bbox_cte = self._tile_bbox_cte(z, x, y, f"{prefix}bbox")
+
+        parts = []
+        for layer in layers:
+            name = f"{prefix}mvt_rows_{layer}"
+            mvt_layer = layer if len(layers) > 1 else "layer"
+            rows_cte = self._mvt_rows_cte(
+                layer, bbox_cte, z, simplify, name, extent, facts
+            )
+            parts.append(
+                select(
+                    func.coalesce(
+                        func.ST_AsMVT(text(f"{name}.*"), mvt_layer, extent, "geom"),
+                        literal(b"", LargeBinary),
+                    )
+                )
+                .select_from(rows_cte)
+                .scalar_subquery()
+            )
+
+        concatenated = parts[0]
+        for part in parts[1:]:
+            concatenated = concatenated.op("||")(part)
+        return concatenated
+
+    def subdivided_bounds(
+        self, layer: str
+    ) -> Sequence[tuple[float, float, float, float]]:
+        """
+        EPSG:3857 (xmin, ymin, xmax, ymax) of every `{layer}_subdivided`
+        piece of a tile layer; input for building its tile coverage index.
+        """
+        pieces = select(
+            func.ST_Transform(SUBDIVIDED_MODELS[layer].geom, 3857).label("geom")
+        ).subquery()
+        stmt = select(
+            func.ST_XMin(pieces.c.geom),
+            func.ST_YMin(pieces.c.geom),
+            func.ST_XMax(pieces.c.geom),
+            func.ST_YMax(pieces.c.geom),
+        )
+        return [tuple(row) for row in self.db.execute(stmt)]
+
+    def tile_coverage(self, layer: str) -> dict[int, bytes]:
+        """Packed coverage codes of `layer` keyed by zoom (empty if not built)."""
+        stmt = select(TileCoverage.zoom, TileCoverage.tiles).where(
+            TileCoverage.layer == layer
+        )
+        return {zoom: bytes(tiles) for zoom, tiles in self.db.execute(stmt)}
+
+    def reverse_cells(self, layer: str) -> dict[int, tuple[bytes, list[str]]]:
+        """
+        Interior grid cells of `layer` keyed by zoom, as (packed codes,
+        geoids) (empty if not built).
+        """
+        stmt = select(ReverseCells.zoom, ReverseCells.cells, ReverseCells.geoids).where(
+            ReverseCells.layer == layer
+        )
+        return {
+            zoom: (bytes(cells), list(geoids))
+            for zoom, cells, geoids in self.db.execute(stmt)
+        }
+
+    def geocode_job(self, job_id: str) -> RowMapping | None:
+        """A bulk geocoding job's row, or None if unknown."""
+        stmt = select(*GeocodeJob.__table__.c).where(GeocodeJob.id == job_id)
+        return self.db.execute(stmt).mappings().first()
+
+    def dataset_version(self) -> RowMapping | None:
+        """
+        Latest loaded dataset as {version, loaded_at}, or None before the
+        first ETL run.
+        """
+        stmt = (
+            select(DatasetVersion.version, DatasetVersion.loaded_at)
+            .order_by(DatasetVersion.loaded_at.desc())
+            .limit(1)
+        )
+        return self.db.execute(stmt).mappings().first()
+
     def health_check(self) -> bool:
         """
         Check if the database connection is healthy.
@@ -1,10 +1,31 @@
+import re
+from collections import defaultdict
+from datetime import timedelta
+
+from sqlalchemy import and_, delete, func, or_, select, text, union_all, update
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 from typing import Iterable, Sequence, Type
 from geoalchemy2.shape import from_shape
 
 from .base import Base
-from .models import International, State, County, MSA, Place, QuickFacts
+from .models import (
+    International,
+    State,
+    County,
+    MSA,
+    Place,
+    QuickFacts,
+    DatasetVersion,
+    TileCoverage,
+    ReverseCells,
+    GeocodeJob,
+    TileGeo,
+    GENERALIZED_LEVELS,
+    SUBDIVIDED_MODELS,
+    SUBDIVIDE_MAX_VERTICES,
+)
 
 
 class WriteQueries:
@@ -15,24 +36,38 @@ class WriteQueries:
 
     def __init__(self, db: Session) -> None:
         self.db = db
+        # EPSG:3857 (xmin, ymin, xmax, ymax) of every row an upsert inserted,
+        # reshaped or renamed (old and new extents), keyed by table
+        self.changed_bounds: defaultdict[
+            str, list[tuple[float, float, float, float]]
+        ] = defaultdict(list)
 
     def _bulk_upsert(
         self,
         table: Type[Base],
         rows: list[dict],
         pkey_cols: Sequence[str],
+        track_changes: bool = False,
     ) -> None:
         """
         Core routine: bulk insert with ON CONFLICT DO UPDATE. Suitable
-        for all static layer tables plus QuickFacts.
+        for all static layer tables plus QuickFacts. With `track_changes`
+        (tile layers only) the extents of rows whose tile output changed
+        are appended to `changed_bounds`.
         """
 
+        if not rows:
+            return
+
         stmt = insert(table).values(rows)
 
+        # columns absent from `rows` (e.g. ETL-derived geometries) keep their
+        # current value instead of being reset to NULL
         update_dict = {
             c.name: stmt.excluded[c.name]
             for c in table.__table__.columns
             if c.name not in pkey_cols
+            and c.name in rows[0]
             and not (hasattr(c, "computed") and c.computed is not None)
             and c.server_default is None
             and c.server_onupdate is None
@@ -40,7 +75,112 @@ class WriteQueries:
 
         stmt = stmt.on_conflict_do_update(index_elements=pkey_cols, set_=update_dict)
 
-        self.db.execute(stmt)
+        if track_changes:
+            self._upsert_tracking_changes(table, stmt)
+        else:
+            self.db.execute(stmt)
+        self.db.commit()
+
+    def _upsert_tracking_changes(self, table: Type[TileGeo], stmt) -> None:
+        """
+        Run the upsert as a data-modifying CTE. The outer query still reads
+        the table as it was before the statement, so joining it to the
+        RETURNING rows compares old and new geometry in one round trip.
+        """
+        up = stmt.returning(table.geoid, table.name, table.geom_3857).cte("up")
+        prev = table.__table__.alias("prev")
+        changed = (
+            select(up.c.geom_3857.label("new"), prev.c.geom_3857.label("old"))
+            .select_from(up.outerjoin(prev, prev.c.geoid == up.c.geoid))
+            .where(
+                or_(
+                    prev.c.geom_3857.is_distinct_from(up.c.geom_3857),
+                    # tiles carry the name too
+                    prev.c.name.is_distinct_from(up.c.name),
+                )
+            )
+            .subquery("changed")
+        )
+
+        def extent(geom):
+            return select(
+                func.ST_XMin(geom),
+                func.ST_YMin(geom),
+                func.ST_XMax(geom),
+                func.ST_YMax(geom),
+            ).where(geom.is_not(None))
+
+        rows = self.db.execute(union_all(extent(changed.c.new), extent(changed.c.old)))
+        self.changed_bounds[table.__tablename__].extend(tuple(r) for r in rows)
+
+    def _coverage_simplify_available(self) -> bool:
+        """ST_CoverageSimplify needs PostGIS >= 3.4 built against GEOS >= 3.12."""
+        postgis, geos = self.db.execute(
+            text("SELECT postgis_lib_version(), postgis_geos_version()")
+        ).one()
+
+        def major_minor(version: str) -> tuple[int, int]:
+            # e.g. "3.4.2", "3.12.1-CAPI-1.18.1", "3.5.0dev"
+            major, minor = re.findall(r"\d+", version)[:2]
+            return int(major), int(minor)
+
+        return major_minor(postgis) >= (3, 4) and major_minor(geos) >= (3, 12)
+
+    def refresh_generalized(self, table: Type[TileGeo]) -> None:
+        """
+        Rebuild every GENERALIZED_LEVELS column of a tile layer from `geom_3857`.
+
+        Uses ST_CoverageSimplify over the whole table so edges shared by
+        neighbouring polygons are simplified once and stay aligned. Older
+        GEOS builds fall back to snapping all vertices to a common grid,
+        which also keeps shared edges identical.
+        """
+        name = table.__tablename__
+        coverage = self._coverage_simplify_available()
+
+        for _, column, tolerance in GENERALIZED_LEVELS:
+            simplified = (
+                "ST_CoverageSimplify(geom_3857, :tol) OVER ()"
+                if coverage
+                else "ST_SnapToGrid(geom_3857, :tol)"
+            )
+            self.db.execute(
+                text(
+                    f"""
+                    UPDATE {name} AS t SET {column} = g.geom
+                    FROM (
+                        SELECT geoid,
+                               ST_Multi(ST_CollectionExtract(
+                                   ST_MakeValid({simplified}), 3
+                               )) AS geom
+                        FROM {name}
+                    ) AS g
+                    WHERE t.geoid = g.geoid
+                    """
+                ),
+                {"tol": tolerance},
+            )
+        self.db.commit()
+
+    def refresh_subdivided(self, table: Type[TileGeo]) -> None:
+        """
+        Rebuild the `{layer}_subdivided` pieces of a polygon layer from its
+        current `geom`; containment queries probe these instead of the
+        whole (often huge) polygons.
+        """
+        pieces_model = SUBDIVIDED_MODELS[table.__tablename__]
+        pieces = select(
+            table.geoid.label("geoid"),
+            func.ST_Subdivide(table.geom, SUBDIVIDE_MAX_VERTICES).label("geom"),
+        ).subquery("pieces")
+
+        self.db.execute(delete(pieces_model))
+        self.db.execute(
+            insert(pieces_model).from_select(
+                ["geoid", "geom"],
+                select(pieces.c.geoid, func.ST_Multi(pieces.c.geom)),
+            )
+        )
         self.db.commit()
 
     def upsert_international(self, rows: Iterable[International]) -> None:
@@ -71,7 +211,7 @@ class WriteQueries:
             }
             values.append(row_dict)
 
-        self._bulk_upsert(State, values, ["geoid"])
+        self._bulk_upsert(State, values, ["geoid"], track_changes=True)
 
     def upsert_counties(self, rows: Iterable[County]) -> None:
         """
@@ -86,7 +226,7 @@ class WriteQueries:
                 "geom": from_shape(row.geom, srid=4326),
             }
             values.append(row_dict)
-        self._bulk_upsert(County, values, ["geoid"])
+        self._bulk_upsert(County, values, ["geoid"], track_changes=True)
 
     def upsert_msas(self, rows: Iterable[MSA]) -> None:
         """
@@ -100,7 +240,7 @@ class WriteQueries:
                 "geom": from_shape(row.geom, srid=4326),
             }
             values.append(row_dict)
-        self._bulk_upsert(MSA, values, ["geoid"])
+        self._bulk_upsert(MSA, values, ["geoid"], track_changes=True)
 
     def upsert_places(self, rows: Iterable[Place]) -> None:
         """
@@ -115,7 +255,7 @@ class WriteQueries:
                 "geom": from_shape(row.geom, srid=4326),
             }
             values.append(row_dict)
-        self._bulk_upsert(Place, values, ["geoid"])
+        self._bulk_upsert(Place, values, ["geoid"], track_changes=True)
 
     def upsert_quickfacts(self, rows: Iterable[QuickFacts]) -> None:
         """
@@ -131,3 +271,158 @@ class WriteQueries:
             values.append(row_dict)
 
         self._bulk_upsert(QuickFacts, values, ["layer", "geoid"])
+
+    def replace_tile_coverage(self, layer: str, blobs: dict[int, bytes]) -> None:
+        """
+        Swap in a freshly built coverage index for `layer` ({zoom: packed
+        codes}) in one transaction.
+        """
+        self.db.execute(delete(TileCoverage).where(TileCoverage.layer == layer))
+        self.db.execute(
+            insert(TileCoverage).values(
+                [
+                    {"layer": layer, "zoom": zoom, "tiles": tiles}
+                    for zoom, tiles in blobs.items()
+                ]
+            )
+        )
+        self.db.commit()
+
+    def replace_reverse_cells(
+        self, layer: str, levels: dict[int, tuple[bytes, list[str]]]
+    ) -> None:
+        """
+        Swap in freshly built interior cells for `layer` ({zoom: (packed
+        codes, geoids)}) in one transaction.
+        """
+        self.db.execute(delete(ReverseCells).where(ReverseCells.layer == layer))
+        if levels:
+            self.db.execute(
+                insert(ReverseCells).values(
+                    [
+                        {"layer": layer, "zoom": zoom, "cells": cells, "geoids": geoids}
+                        for zoom, (cells, geoids) in levels.items()
+                    ]
+                )
+            )
+        self.db.commit()
+
+    def create_geocode_job(
+        self,
+        job_id: str,
+        input_key: str,
+        format: str,
+        lat_column: str,
+        lon_column: str,
+    ) -> RowMapping:
+        """Queue a bulk geocoding job and return its row."""
+        row = (
+            self.db.execute(
+                insert(GeocodeJob)
+                .values(
+                    id=job_id,
+                    input_key=input_key,
+                    format=format,
+                    lat_column=lat_column,
+                    lon_column=lon_column,
+                )
+                .returning(*GeocodeJob.__table__.c)
+            )
+            .mappings()
+            .one()
+        )
+        self.db.commit()
+        return row
+
+    def claim_geocode_job(
+        self, lease_seconds: int = 300, max_attempts: int = 3
+    ) -> RowMapping | None:
+        """
+        Mark the oldest claimable job running and return it, or None if
+        there is none. Claimable means queued, or running with no heartbeat
+        for `lease_seconds` (its worker died); a job abandoned that way
+        `max_attempts` times is failed instead of claimed again. SKIP
+        LOCKED lets several workers poll concurrently without ever claiming
+        the same job.
+        """
+        stale = and_(
+            GeocodeJob.status == "running",
+            GeocodeJob.heartbeat_at < func.now() - timedelta(seconds=lease_seconds),
+        )
+        self.db.execute(
+            update(GeocodeJob)
+            .where(stale, GeocodeJob.attempts >= max_attempts)
+            .values(
+                status="failed",
+                error=f"worker lost {max_attempts} times; giving up",
+                finished_at=func.now(),
+            )
+        )
+
+        oldest = (
+            select(GeocodeJob.id)
+            .where(or_(GeocodeJob.status == "queued", stale))
+            .order_by(GeocodeJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        row = (
+            self.db.execute(
+                update(GeocodeJob)
+                .where(GeocodeJob.id == oldest)
+                .values(
+                    status="running",
+                    rows_done=0,
+                    attempts=GeocodeJob.attempts + 1,
+                    started_at=func.now(),
+                    heartbeat_at=func.now(),
+                )
+                .returning(*GeocodeJob.__table__.c)
+            )
+            .mappings()
+            .first()
+        )
+        self.db.commit()
+        return row
+
+    def heartbeat_geocode_job(self, job_id: str) -> None:
+        """Renew a running job's lease."""
+        self.db.execute(
+            update(GeocodeJob)
+            .where(GeocodeJob.id == job_id)
+            .values(heartbeat_at=func.now())
+        )
+        self.db.commit()
+
+    def set_geocode_job_progress(self, job_id: str, rows_done: int) -> None:
+        self.db.execute(
+            update(GeocodeJob)
+            .where(GeocodeJob.id == job_id)
+            .values(rows_done=rows_done, heartbeat_at=func.now())
+        )
+        self.db.commit()
+
+    def finish_geocode_job(
+        self, job_id: str, output_key: str | None = None, error: str | None = None
+    ) -> None:
+        """Record a job's outcome: `output_key` on success, `error` on failure."""
+        self.db.execute(
+            update(GeocodeJob)
+            .where(GeocodeJob.id == job_id)
+            .values(
+                status="failed" if error is not None else "succeeded",
+                output_key=output_key,
+                error=error,
+                finished_at=func.now(),
+            )
+        )
+        self.db.commit()
+
+    def record_dataset_version(self, version: str) -> None:
+        """
+        Mark `version` as the live dataset. Call once, after every other
+        write of the load has committed.
+        """
+        self.db.execute(insert(DatasetVersion).values(version=version))
+        self.db.commit()
@@ -1,3 +1,19 @@
-from .s3_utils import iter_objects, download_to_tempfile, get_s3_client, list_s3_dir
+from .s3_utils import (
+    iter_objects,
+    download_to_tempfile,
+    get_s3_client,
+    list_s3_dir,
+    object_exists,
+    presigned_url,
+    upload_file,
+)
 
-__all__ = ["iter_objects", "download_to_tempfile", "get_s3_client", "list_s3_dir"]
+__all__ = [
+    "iter_objects",
+    "download_to_tempfile",
+    "get_s3_client",
+    "list_s3_dir",
+    "object_exists",
+    "presigned_url",
+    "upload_file",
+]
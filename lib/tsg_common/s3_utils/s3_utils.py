@@ -3,6 +3,7 @@ import tempfile
 from pathlib import Path
 import boto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
 
 
 def get_s3_client(region: str, endpoint: str | None = None):
@@ -62,3 +63,26 @@ def download_to_tempfile(s3: Any, bucket: str, key: str) -> Path:
     local = Path(tmpdir) / Path(key).name
     s3.download_file(bucket, key, str(local))
     return local
+
+
+def upload_file(s3: Any, local: Path, bucket: str, key: str) -> None:
+    """Upload a local file to bucket/key."""
+    s3.upload_file(str(local), bucket, key)
+
+
+def object_exists(s3: Any, bucket: str, key: str) -> bool:
+    """True if bucket/key exists (HEAD request)."""
+    try:
+        s3.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+            return False
+        raise
+    return True
+
+
+def presigned_url(s3: Any, bucket: str, key: str, expires: int = 3600) -> str:
+    """Time-limited GET URL for bucket/key."""
+    return s3.generate_presigned_url(
+        "get_object", Params={"Bucket": bucket, "Key": key}, ExpiresIn=expires
+    )
@@ -0,0 +1,3 @@
+from .tile_math import lonlat_to_tile, tiles_in_bbox, tiles_in_mercator_bbox, tile_key
+
+__all__ = ["lonlat_to_tile", "tiles_in_bbox", "tiles_in_mercator_bbox", "tile_key"]
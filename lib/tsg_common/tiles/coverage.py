@@ -0,0 +1,82 @@
+"""
+Per-layer index of which tiles contain any feature, so the API can answer
+empty (ocean, out-of-country) tiles without Redis or PostGIS.
+
+Each zoom level is a sorted array of `(x << z) | y` codes; a tile deeper than
+the index's max zoom is looked up through its ancestor at that zoom.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable
+
+from .tile_math import BUFFER_FRACTION, MERCATOR_MAX, tiles_in_mercator_bbox
+
+
+def _code(z: int, x: int, y: int) -> int:
+    return (x << z) | y
+
+
+def _to_bytes(codes: array) -> bytes:
+    # stored little-endian whatever the host byte order
+    if sys.byteorder != "little":
+        codes = array("Q", codes)
+        codes.byteswap()
+    return codes.tobytes()
+
+
+def _from_bytes(blob: bytes) -> array:
+    codes = array("Q")
+    codes.frombytes(blob)
+    if sys.byteorder != "little":
+        codes.byteswap()
+    return codes
+
+
+class CoverageIndex:
+    def __init__(self, levels: dict[int, array]):
+        self.levels = levels
+        self.max_zoom = max(levels)
+
+    @classmethod
+    def from_mercator_boxes(
+        cls, boxes: Iterable[tuple[float, float, float, float]], max_zoom: int
+    ) -> "CoverageIndex":
+        """
+        Build from EPSG:3857 (xmin, ymin, xmax, ymax) boxes of the layer's
+        geometry; subdivided pieces give a much tighter index than whole
+        feature extents. Every tile whose buffered extent touches a box is
+        marked non-empty, since the render buffer draws the feature there too.
+        """
+        boxes = list(boxes)
+        levels: dict[int, array] = {}
+        for z in range(max_zoom + 1):
+            # the buffer is a fixed fraction of a tile, so wider at low zooms
+            pad = 2 * MERCATOR_MAX / (1 << z) * BUFFER_FRACTION
+            tiles: set[tuple[int, int]] = set()
+            for xmin, ymin, xmax, ymax in boxes:
+                padded = (xmin - pad, ymin - pad, xmax + pad, ymax + pad)
+                tiles.update(tiles_in_mercator_bbox(padded, z))
+            levels[z] = array("Q", sorted(_code(z, x, y) for x, y in tiles))
+        return cls(levels)
+
+    @classmethod
+    def from_blobs(cls, blobs: dict[int, bytes]) -> "CoverageIndex":
+        return cls({z: _from_bytes(blob) for z, blob in blobs.items()})
+
+    def to_blobs(self) -> dict[int, bytes]:
+        return {z: _to_bytes(codes) for z, codes in self.levels.items()}
+
+    def is_empty(self, z: int, x: int, y: int) -> bool:
+        """True only if the tile is known to contain no features."""
+        if z > self.max_zoom:
+            shift = z - self.max_zoom
+            z, x, y = self.max_zoom, x >> shift, y >> shift
+
+        codes = self.levels.get(z)
+        if codes is None:
+            return False
+        code = _code(z, x, y)
+        i = bisect_left(codes, code)
+        return i == len(codes) or codes[i] != code
@@ -0,0 +1,158 @@
+"""
+Minimal MBTiles 1.3 reader / writer (one SQLite file per tile layer).
+
+Tiles are addressed in XYZ on the way in and out; the TMS row flip that
+the spec requires happens here. Tile blobs are stored gzip-compressed, as
+the spec recommends for `pbf` tilesets.
+"""
+
+import gzip
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from .tile_math import lonlat_to_tile
+
+
+def _tms_row(z: int, y: int) -> int:
+    return (1 << z) - 1 - y
+
+
+class MBTilesWriter:
+    """Write-once exporter; use as a context manager so the file is finalised."""
+
+    def __init__(self, path: Path, layer: str):
+        self.path = path
+        self.layer = layer
+        path.unlink(missing_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            """
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE metadata (name TEXT, value TEXT);
+            CREATE TABLE tiles (
+                zoom_level INTEGER,
+                tile_column INTEGER,
+                tile_row INTEGER,
+                tile_data BLOB
+            );
+            """
+        )
+
+    def put_tile(self, z: int, x: int, y: int, data: bytes) -> None:
+        self.conn.execute(
+            "INSERT INTO tiles VALUES (?, ?, ?, ?)",
+            (z, x, _tms_row(z, y), gzip.compress(data)),
+        )
+
+    def finalize(
+        self,
+        min_zoom: int,
+        max_zoom: int,
+        bbox: tuple[float, float, float, float],
+        version: str | None = None,
+    ) -> None:
+        metadata = {
+            "name": self.layer,
+            "format": "pbf",
+            "type": "overlay",
+            "minzoom": str(min_zoom),
+            "maxzoom": str(max_zoom),
+            "bounds": ",".join(str(v) for v in bbox),
+            "json": json.dumps(
+                {
+                    "vector_layers": [
+                        {
+                            "id": "layer",
+                            "fields": {"geoid": "String", "name": "String"},
+                        }
+                    ]
+                }
+            ),
+        }
+        if version is not None:
+            metadata["version"] = version
+
+        self.conn.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+        self.conn.execute(
+            "CREATE UNIQUE INDEX tile_index ON tiles "
+            "(zoom_level, tile_column, tile_row)"
+        )
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "MBTilesWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class MBTilesReader:
+    """
+    Read-only, memory-mapped access to an exported archive. Each thread
+    gets its own SQLite connection so FastAPI's threadpool never contends.
+    """
+
+    def __init__(self, path: Path, mmap_size: int = 1 << 30):
+        self.path = path
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+
+        meta = dict(self._conn().execute("SELECT name, value FROM metadata"))
+        self.min_zoom = int(meta["minzoom"])
+        self.max_zoom = int(meta["maxzoom"])
+        min_lon, min_lat, max_lon, max_lat = (
+            float(v) for v in meta["bounds"].split(",")
+        )
+        self.bounds = (min_lon, min_lat, max_lon, max_lat)
+        # dataset version the archive was exported from, if stamped
+        self.version = meta.get("version")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # immutable=1 lets SQLite skip locking entirely; archives are
+            # never rewritten in place, a new version gets a new file
+            conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro&immutable=1",
+                uri=True,
+                check_same_thread=False,
+            )
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+            self._local.conn = conn
+        return conn
+
+    def covers(self, z: int, x: int, y: int) -> bool:
+        """
+        True if the tile lies inside the exported zoom range and bounds, in
+        which case a missing row means the tile is empty.
+        """
+        if not self.min_zoom <= z <= self.max_zoom:
+            return False
+        min_lon, min_lat, max_lon, max_lat = self.bounds
+        x0, y0 = lonlat_to_tile(min_lon, max_lat, z)
+        x1, y1 = lonlat_to_tile(max_lon, min_lat, z)
+        return x0 <= x <= x1 and y0 <= y <= y1
+
+    def get_tile(self, z: int, x: int, y: int) -> bytes | None:
+        data = self.get_tile_gzip(z, x, y)
+        return None if data is None else gzip.decompress(data)
+
+    def get_tile_gzip(self, z: int, x: int, y: int) -> bytes | None:
+        """The stored blob as-is, for clients that accept gzip."""
+        row = (
+            self._conn()
+            .execute(
+                "SELECT tile_data FROM tiles "
+                "WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, _tms_row(z, y)),
+            )
+            .fetchone()
+        )
+        return None if row is None else row[0]
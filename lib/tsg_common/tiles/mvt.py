@@ -0,0 +1,374 @@
+"""
+Just enough of the Mapbox Vector Tile (protobuf) format to derive an
+overzoomed child tile from its parent in-process.
+
+Only feature geometry is decoded: layer names, keys, values, feature ids and
+tags are copied through byte-for-byte, so properties survive untouched.
+"""
+
+from typing import Iterator
+
+# Tile / Layer / Feature field numbers from vector_tile.proto
+_TILE_LAYERS = 3
+_LAYER_FEATURES = 2
+_LAYER_EXTENT = 5
+_FEATURE_TYPE = 3
+_FEATURE_GEOMETRY = 4
+
+_POINT, _LINESTRING, _POLYGON = 1, 2, 3
+_MOVE_TO, _LINE_TO, _CLOSE_PATH = 1, 2, 7
+
+Ring = list[tuple[float, float]]
+
+
+# ---- protobuf wire format ---- #
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        b = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _fields(buf: bytes) -> Iterator[tuple[int, int, bytes | int, bytes]]:
+    """Yield (field number, wire type, value, raw field bytes) for a message."""
+    pos = 0
+    while pos < len(buf):
+        start = pos
+        key, pos = _read_varint(buf, pos)
+        field, wire = key >> 3, key & 0x7
+        value: bytes | int
+        if wire == 0:
+            value, pos = _read_varint(buf, pos)
+        elif wire == 1:
+            value, pos = buf[pos : pos + 8], pos + 8
+        elif wire == 2:
+            length, pos = _read_varint(buf, pos)
+            value, pos = buf[pos : pos + length], pos + length
+        elif wire == 5:
+            value, pos = buf[pos : pos + 4], pos + 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire}")
+        yield field, wire, value, buf[start:pos]
+
+
+def _length_delimited(field: int, payload: bytes) -> bytes:
+    return _varint(field << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _packed(values: list[int]) -> bytes:
+    return b"".join(_varint(v) for v in values)
+
+
+def _unpacked(buf: bytes) -> list[int]:
+    values, pos = [], 0
+    while pos < len(buf):
+        v, pos = _read_varint(buf, pos)
+        values.append(v)
+    return values
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _unzigzag(n: int) -> int:
+    return (n >> 1) ^ -(n & 1)
+
+
+# ---- geometry commands ---- #
+def _decode_geometry(commands: list[int]) -> list[tuple[int, Ring]]:
+    """Split a command stream into (command, points) parts in tile units."""
+    parts: list[tuple[int, Ring]] = []
+    x = y = i = 0
+    while i < len(commands):
+        cmd, count = commands[i] & 0x7, commands[i] >> 3
+        i += 1
+        if cmd == _CLOSE_PATH:
+            continue
+        points: Ring = []
+        for _ in range(count):
+            x += _unzigzag(commands[i])
+            y += _unzigzag(commands[i + 1])
+            i += 2
+            points.append((x, y))
+        if cmd == _MOVE_TO:
+            parts.append((cmd, points))
+        else:
+            parts[-1][1].extend(points)
+    return parts
+
+
+def _bounds(commands: list[int]) -> tuple[int, int, int, int] | None:
+    """(xmin, ymin, xmax, ymax) of a command stream's vertices, in tile units."""
+    xs: list[int] = []
+    ys: list[int] = []
+    x = y = i = 0
+    while i < len(commands):
+        cmd, count = commands[i] & 0x7, commands[i] >> 3
+        i += 1
+        if cmd == _CLOSE_PATH:
+            continue
+        for _ in range(count):
+            x += _unzigzag(commands[i])
+            y += _unzigzag(commands[i + 1])
+            xs.append(x)
+            ys.append(y)
+            i += 2
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _encode_geometry(
+    geom_type: int, parts: list[list[tuple[int, int]]]
+) -> list[int]:
+    commands: list[int] = []
+    cx = cy = 0
+
+    def emit(points: list[tuple[int, int]]) -> None:
+        nonlocal cx, cy
+        for x, y in points:
+            commands.extend((_zigzag(x - cx), _zigzag(y - cy)))
+            cx, cy = x, y
+
+    if geom_type == _POINT:
+        points = [p for part in parts for p in part]
+        commands.append(_MOVE_TO | len(points) << 3)
+        emit(points)
+        return commands
+
+    for points in parts:
+        commands.append(_MOVE_TO | 1 << 3)
+        emit(points[:1])
+        commands.append(_LINE_TO | (len(points) - 1) << 3)
+        emit(points[1:])
+        if geom_type == _POLYGON:
+            commands.append(_CLOSE_PATH | 1 << 3)
+    return commands
+
+
+def _ring_area(ring: Ring) -> float:
+    """Twice the surveyor's-formula area; > 0 marks an exterior MVT ring."""
+    return sum(
+        x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1])
+    )
+
+
+# ---- clipping against the child tile (plus buffer) ---- #
+def _clip_ring(ring: Ring, lo: float, hi: float) -> Ring:
+    """Sutherland–Hodgman clip of a closed ring to the square [lo, hi]²."""
+    edges = (
+        (0, lo, True),
+        (0, hi, False),
+        (1, lo, True),
+        (1, hi, False),
+    )
+    for axis, bound, keep_above in edges:
+        if not ring:
+            break
+
+        def inside(p: tuple[float, float]) -> bool:
+            return p[axis] >= bound if keep_above else p[axis] <= bound
+
+        def cross(a: tuple[float, float], b: tuple[float, float]):
+            t = (bound - a[axis]) / (b[axis] - a[axis])
+            return (a[0] + t * (b[0] - a[0]), a[1] + t * (b[1] - a[1]))
+
+        out: Ring = []
+        prev = ring[-1]
+        for cur in ring:
+            if inside(cur):
+                if not inside(prev):
+                    out.append(cross(prev, cur))
+                out.append(cur)
+            elif inside(prev):
+                out.append(cross(prev, cur))
+            prev = cur
+        ring = out
+    return ring
+
+
+def _clip_line(line: Ring, lo: float, hi: float) -> list[Ring]:
+    """Liang–Barsky clip of a polyline, split where it leaves the square."""
+    pieces: list[Ring] = []
+    current: Ring = []
+    for (x0, y0), (x1, y1) in zip(line, line[1:]):
+        t0, t1 = 0.0, 1.0
+        dx, dy = x1 - x0, y1 - y0
+        visible = True
+        bounds = ((-dx, x0 - lo), (dx, hi - x0), (-dy, y0 - lo), (dy, hi - y0))
+        for p, q in bounds:
+            if p == 0:
+                if q < 0:
+                    visible = False
+                    break
+                continue
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+            if t0 > t1:
+                visible = False
+                break
+        if not visible:
+            if len(current) > 1:
+                pieces.append(current)
+            current = []
+            continue
+        a = (x0 + t0 * dx, y0 + t0 * dy)
+        b = (x0 + t1 * dx, y0 + t1 * dy)
+        if not current:
+            current = [a]
+        current.append(b)
+        if t1 < 1.0:
+            pieces.append(current)
+            current = []
+    if len(current) > 1:
+        pieces.append(current)
+    return pieces
+
+
+def _snap(points: Ring) -> list[tuple[int, int]]:
+    """Round to integer tile units, dropping consecutive duplicates."""
+    out: list[tuple[int, int]] = []
+    for x, y in points:
+        p = (round(x), round(y))
+        if not out or out[-1] != p:
+            out.append(p)
+    return out
+
+
+def _transform_feature(
+    geom_type: int,
+    commands: list[int],
+    scale: int,
+    ox: float,
+    oy: float,
+    lo: float,
+    hi: float,
+) -> list[int] | None:
+    parts = [
+        [(x * scale - ox, y * scale - oy) for x, y in points]
+        for _, points in _decode_geometry(commands)
+    ]
+
+    out: list[list[tuple[int, int]]] = []
+    if geom_type == _POINT:
+        for points in parts:
+            for x, y in points:
+                if lo <= x <= hi and lo <= y <= hi:
+                    out.append([(round(x), round(y))])
+
+    elif geom_type == _LINESTRING:
+        for points in parts:
+            for piece in _clip_line(points, lo, hi):
+                snapped = _snap(piece)
+                if len(snapped) > 1:
+                    out.append(snapped)
+
+    elif geom_type == _POLYGON:
+        keep_holes = False
+        for points in parts:
+            # orientation comes from the unclipped ring: uniform scaling and
+            # clipping never flip it, but can shrink it to nothing
+            exterior = _ring_area(points) > 0
+            ring = _snap(_clip_ring(points, lo, hi))
+            if len(ring) > 1 and ring[0] == ring[-1]:
+                ring.pop()
+            valid = len(ring) >= 3 and _ring_area(ring) != 0
+            if exterior:
+                keep_holes = valid
+                if valid:
+                    out.append(ring)
+            elif keep_holes and valid:
+                out.append(ring)
+    else:
+        return None
+
+    return _encode_geometry(geom_type, out) if out else None
+
+
+def _transform_layer(
+    layer: bytes, dz: int, dx: int, dy: int, buffer: int
+) -> bytes | None:
+    extent = 4096
+    for field, _, value, _ in _fields(layer):
+        if field == _LAYER_EXTENT:
+            extent = int(value)  # type: ignore[arg-type]
+
+    scale = 1 << dz
+    ox, oy = dx * extent, dy * extent
+    lo, hi = -buffer, extent + buffer
+    # the child's buffered window in parent units, to drop features whose
+    # bounds miss it before paying for the transform and clip
+    wx0, wy0 = (ox + lo) / scale, (oy + lo) / scale
+    wx1, wy1 = (ox + hi) / scale, (oy + hi) / scale
+
+    out = bytearray()
+    features = 0
+    for field, _, value, raw in _fields(layer):
+        if field != _LAYER_FEATURES:
+            out += raw  # name, keys, values, extent, version: unchanged
+            continue
+
+        geom_type = 0
+        commands: list[int] = []
+        kept = bytearray()
+        for f_field, _, f_value, f_raw in _fields(value):  # type: ignore[arg-type]
+            if f_field == _FEATURE_GEOMETRY:
+                commands = _unpacked(f_value)  # type: ignore[arg-type]
+            else:
+                if f_field == _FEATURE_TYPE:
+                    geom_type = int(f_value)  # type: ignore[arg-type]
+                kept += f_raw  # id, tags, type
+
+        bounds = _bounds(commands)
+        if bounds is None:
+            continue
+        xmin, ymin, xmax, ymax = bounds
+        if xmax < wx0 or xmin > wx1 or ymax < wy0 or ymin > wy1:
+            continue
+
+        geometry = _transform_feature(geom_type, commands, scale, ox, oy, lo, hi)
+        if geometry is None:
+            continue
+        kept += _length_delimited(_FEATURE_GEOMETRY, _packed(geometry))
+        out += _length_delimited(_LAYER_FEATURES, bytes(kept))
+        features += 1
+
+    return bytes(out) if features else None
+
+
+def overzoom(parent: bytes, dz: int, dx: int, dy: int, buffer: int = 64) -> bytes:
+    """
+    Cut a child tile out of `parent`. The child sits `dz` zooms deeper, at
+    offset (dx, dy) child tiles from the parent's top-left corner. Geometry
+    is rescaled and clipped to the child extent plus `buffer` units; empty
+    layers are dropped, so an empty result means an empty tile.
+    """
+    out = bytearray()
+    for field, _, value, raw in _fields(parent):
+        if field != _TILE_LAYERS:
+            out += raw
+            continue
+        layer = _transform_layer(value, dz, dx, dy, buffer)  # type: ignore[arg-type]
+        if layer is not None:
+            out += _length_delimited(_TILE_LAYERS, layer)
+    return bytes(out)
@@ -0,0 +1,145 @@
+"""
+Tile rendering shared by the API and the ETL (Redis seeder, MBTiles
+export), so every tile that reaches Redis or an archive went through the
+same byte budget. Needs the `db` extra.
+"""
+
+import logging
+from typing import TYPE_CHECKING, Callable, Sequence
+
+from ..db import ReadQueries
+from ..db.read_queries import PLACES_POLYGON_MIN_ZOOM, TILE_MODELS, generalized_column
+
+if TYPE_CHECKING:
+    from ..cache import Cache
+
+logger = logging.getLogger(__name__)
+
+# Default per-layer mvt byte budget; composite tiles get the sum of theirs
+TILES_MAX_BYTES: dict[str, int] = {layer: 512 * 1024 for layer in TILE_MODELS}
+
+Tile = bytes | str | None
+
+
+def renderer(
+    rq: ReadQueries,
+    layers: Sequence[str],
+    z: int,
+    x: int,
+    y: int,
+    ext: str = "mvt",
+    facts: Sequence[str] = (),
+) -> Callable[[int, int], Tile]:
+    """Render one tile at a given (simplify, extent)."""
+
+    def render(simplify: int, extent: int) -> Tile:
+        if len(layers) > 1:
+            # one MVT layer per entry, named after it
+            return rq.composite_tile_data(
+                layers, z, x, y, simplify=simplify, extent=extent, facts=facts
+            )
+        return rq.tile_data(
+            layers[0],
+            z,
+            x,
+            y,
+            format=ext,
+            simplify=simplify,
+            extent=extent,
+            facts=facts,
+        )
+
+    return render
+
+
+def render_tile(
+    rq: ReadQueries,
+    layers: Sequence[str],
+    z: int,
+    x: int,
+    y: int,
+    ext: str = "mvt",
+    simplify: int = 0,
+    facts: Sequence[str] = (),
+    max_bytes: dict[str, int] = TILES_MAX_BYTES,
+    stats: "Cache | None" = None,
+) -> Tile:
+    """Render from PostGIS, kept within the byte budget (see `fit_budget`)."""
+    render = renderer(rq, layers, z, x, y, ext, facts)
+    tile = render(simplify, 4096)
+    return fit_budget(tile, layers, z, x, y, ext, simplify, render, max_bytes, stats)
+
+
+def fit_budget(
+    tile: Tile,
+    layers: Sequence[str],
+    z: int,
+    x: int,
+    y: int,
+    ext: str,
+    simplify: int,
+    render: Callable[[int, int], Tile],
+    max_bytes: dict[str, int] = TILES_MAX_BYTES,
+    stats: "Cache | None" = None,
+) -> Tile:
+    """
+    An mvt over its byte budget (the sum of its layers' `max_bytes`) is
+    re-rendered from each coarser generalised band, then at lower extents,
+    until it fits or the ladder runs out; the smallest attempt wins. Places
+    polygons are never coarsened into cluster points. Each oversize tile is
+    logged and, given `stats`, counted in the `stats:tiles:oversize` hash.
+    """
+    if ext != "mvt" or tile is None or any(name not in max_bytes for name in layers):
+        return tile
+    budget = sum(max_bytes[name] for name in layers)
+    if len(tile) <= budget:
+        return tile
+
+    # past `z - PLACES_POLYGON_MIN_ZOOM` places render as clusters with
+    # no geoid or name, which is a different tile, not a coarser one
+    max_simplify = z
+    if "places" in layers and z - simplify >= PLACES_POLYGON_MIN_ZOOM:
+        max_simplify = z - PLACES_POLYGON_MIN_ZOOM
+
+    # one retry per generalised band coarser than the requested one...
+    ladder: list[tuple[int, int]] = []
+    column = generalized_column(z, simplify)
+    for coarser in range(simplify + 1, max_simplify + 1):
+        if generalized_column(z, coarser) != column:
+            column = generalized_column(z, coarser)
+            ladder.append((coarser, 4096))
+    # ...then from the coarsest band at lower extents
+    coarsest = ladder[-1][0] if ladder else simplify
+    ladder += [(coarsest, extent) for extent in (2048, 1024, 512)]
+
+    oversize = len(tile)
+    best_simplify, best_extent = simplify, 4096
+    for step_simplify, extent in ladder:
+        candidate = render(step_simplify, extent)
+        if candidate is None:
+            break
+        if len(candidate) < len(tile):
+            tile = candidate
+            best_simplify, best_extent = step_simplify, extent
+        if len(tile) <= budget:
+            break
+
+    layer = ",".join(layers)
+    if stats is not None:
+        stats.hincr("stats:tiles:oversize", layer)
+    logger.warning(
+        "Tile over byte budget, re-rendered coarser",
+        extra={
+            "layer": layer,
+            "z": z,
+            "x": x,
+            "y": y,
+            "budget": budget,
+            "bytes_before": oversize,
+            "bytes_after": len(tile),
+            "simplify": best_simplify,
+            "extent": best_extent,
+            "fits": len(tile) <= budget,
+        },
+    )
+    return tile
@@ -0,0 +1,100 @@
+"""
+Web-Mercator (XYZ / slippy-map) tile arithmetic shared by the API and ETL.
+Pure Python so it can be imported without any of the optional extras.
+"""
+
+import hashlib
+import math
+from typing import Iterator, Sequence
+
+MAX_LAT = 85.0511287798066
+# Web-Mercator half-circumference in metres (EPSG:3857 extent)
+MERCATOR_MAX = 20037508.342789244
+# tiles are rendered with a 256-unit buffer at extent 4096, so a feature
+# shows up in neighbouring tiles up to 1/16 of a tile away
+BUFFER_FRACTION = 256 / 4096
+
+
+def lonlat_to_tile(lon: float, lat: float, z: int) -> tuple[int, int]:
+    """
+    Return the (x, y) of the tile at zoom `z` that contains lon/lat.
+    Latitudes beyond the Web-Mercator limit are clamped.
+    """
+    n = 1 << z
+    lat = max(-MAX_LAT, min(MAX_LAT, lat))
+    lat_rad = math.radians(lat)
+
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+
+    # lon == 180 / lat == -MAX_LAT land exactly on the far edge
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def mercator_to_tile(mx: float, my: float, z: int) -> tuple[int, int]:
+    """Same as `lonlat_to_tile` for an EPSG:3857 coordinate in metres."""
+    n = 1 << z
+    x = int((mx + MERCATOR_MAX) / (2 * MERCATOR_MAX) * n)
+    y = int((MERCATOR_MAX - my) / (2 * MERCATOR_MAX) * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_mercator_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """EPSG:3857 (xmin, ymin, xmax, ymax) of a tile."""
+    size = 2 * MERCATOR_MAX / (1 << z)
+    xmin = -MERCATOR_MAX + x * size
+    ymax = MERCATOR_MAX - y * size
+    return xmin, ymax - size, xmin + size, ymax
+
+
+def tiles_in_bbox(
+    bbox: tuple[float, float, float, float], z: int
+) -> Iterator[tuple[int, int]]:
+    """
+    Yield every (x, y) at zoom `z` intersecting a (min_lon, min_lat,
+    max_lon, max_lat) bounding box, row by row.
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    x0, y0 = lonlat_to_tile(min_lon, max_lat, z)
+    x1, y1 = lonlat_to_tile(max_lon, min_lat, z)
+
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            yield x, y
+
+
+def tiles_in_mercator_bbox(
+    bbox: tuple[float, float, float, float], z: int
+) -> Iterator[tuple[int, int]]:
+    """Same as `tiles_in_bbox` for an EPSG:3857 (xmin, ymin, xmax, ymax) box."""
+    xmin, ymin, xmax, ymax = bbox
+    x0, y0 = mercator_to_tile(xmin, ymax, z)
+    x1, y1 = mercator_to_tile(xmax, ymin, z)
+
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            yield x, y
+
+
+def facts_digest(facts: Sequence[str]) -> str:
+    """Short stable digest of a QuickFacts field set (order-insensitive)."""
+    joined = "\x1f".join(sorted(set(facts)))
+    return hashlib.blake2b(joined.encode(), digest_size=8).hexdigest()
+
+
+def tile_key(
+    layer: str,
+    z: int,
+    x: int,
+    y: int,
+    ext: str,
+    simplify: int = 0,
+    facts: Sequence[str] = (),
+) -> str:
+    """Redis key under which the API caches a rendered tile."""
+    key = f"tile:{layer}:{z}:{x}:{y}:{ext}"
+    if simplify:
+        key = f"{key}:s{simplify}"
+    if facts:
+        key = f"{key}:f{facts_digest(facts)}"
+    return key
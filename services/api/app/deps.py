@@ -1,10 +1,33 @@
 import logging
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Generic, TypeVar
 
+from fastapi import Depends
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.orm import Session
+from tsg_common.db import ReadQueries
+from tsg_common.db.read_queries import REVERSE_MODELS
 from tsg_common.db.engine import SessionLocal
 from tsg_common.cache import Cache
+from tsg_common.s3_utils import get_s3_client, iter_objects
+from tsg_common.tiles.coverage import CoverageIndex
+from tsg_common.tiles.mbtiles import MBTilesReader
+
+from app.models.geo import LAYERS
+from app.spatial import PlacesIndex, ReverseCells, ReverseIndex
+from app.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def get_db():
     db = SessionLocal()
@@ -23,3 +46,280 @@ def get_cache() -> Cache:
     except Exception as e:
         logger.error(f"Failed to initialize cache: {str(e)}", exc_info=True)
         raise
+
+
+@lru_cache()
+def get_s3():
+    """
+    Shared boto3 S3 client (thread-safe) for the bulk geocoding jobs and
+    tile archive downloads.
+    """
+    settings = get_settings()
+    return get_s3_client(settings.aws_region, settings.s3_endpoint)
+
+
+_dataset_lock = threading.Lock()
+_dataset_version: RowMapping | None = None
+_dataset_checked_at = 0.0
+
+
+def get_dataset_version(db: Session = Depends(get_db)) -> RowMapping | None:
+    """
+    Live dataset {version, loaded_at}, cached per worker for
+    `dataset_version_ttl` seconds so most requests never query it.
+    """
+    global _dataset_version, _dataset_checked_at
+
+    ttl = get_settings().dataset_version_ttl
+    if time.monotonic() - _dataset_checked_at < ttl:
+        return _dataset_version
+
+    with _dataset_lock:
+        if time.monotonic() - _dataset_checked_at >= ttl:
+            _dataset_version = ReadQueries(db).dataset_version()
+            _dataset_checked_at = time.monotonic()
+    return _dataset_version
+
+
+class PerDatasetVersion(Generic[T]):
+    """
+    A per-worker value built from the DB and rebuilt whenever the live
+    dataset version changes. Builds run on a background thread with their
+    own session; until the current version's value is ready `get` returns
+    None, so callers fall back to PostGIS instead of blocking on the load
+    or answering from the previous version's data. Until the first ETL run
+    it is never built.
+    """
+
+    # a failed build is retried by the first request after this many seconds
+    retry_seconds = 30.0
+
+    def __init__(self, name: str, build: Callable[[Session], T]):
+        self.name = name
+        self.build = build
+        self._lock = threading.Lock()
+        # (version, value), swapped in as one object so readers never pair
+        # a version with another version's value
+        self._loaded: tuple[str, T] | None = None
+        self._building: str | None = None
+        self._failed_at = -math.inf
+
+    def get(self, dataset: RowMapping | None) -> T | None:
+        if dataset is None:
+            return None
+        version = dataset["version"]
+        loaded = self._loaded
+        if loaded is not None and loaded[0] == version:
+            return loaded[1]
+
+        with self._lock:
+            if (
+                (self._loaded is None or self._loaded[0] != version)
+                and self._building != version
+                and time.monotonic() - self._failed_at >= self.retry_seconds
+            ):
+                self._building = version
+                threading.Thread(
+                    target=self._load,
+                    args=(version,),
+                    name=f"load-{self.name}",
+                    daemon=True,
+                ).start()
+        return None
+
+    def _load(self, version: str) -> None:
+        started = time.monotonic()
+        db = SessionLocal()
+        try:
+            value = self.build(db)
+        except Exception as e:
+            logger.error(
+                "In-memory index load failed",
+                extra={"index": self.name, "version": version, "error": str(e)},
+                exc_info=True,
+            )
+            with self._lock:
+                self._building = None
+                self._failed_at = time.monotonic()
+            return
+        finally:
+            db.close()
+
+        with self._lock:
+            self._loaded = (version, value)
+            self._building = None
+        logger.info(
+            "In-memory index loaded",
+            extra={
+                "index": self.name,
+                "version": version,
+                "seconds": round(time.monotonic() - started, 3),
+            },
+        )
+
+
+def _load_tile_coverage(db: Session) -> dict[str, CoverageIndex]:
+    rq = ReadQueries(db)
+    indexes: dict[str, CoverageIndex] = {}
+    for layer in LAYERS:
+        blobs = rq.tile_coverage(layer)
+        if blobs:
+            indexes[layer] = CoverageIndex.from_blobs(blobs)
+    return indexes
+
+
+_tile_coverage = PerDatasetVersion("tile_coverage", _load_tile_coverage)
+
+
+def get_tile_coverage(
+    dataset: RowMapping | None = Depends(get_dataset_version),
+) -> dict[str, CoverageIndex]:
+    """Empty-tile indexes by layer; layers without one are always rendered."""
+    if not get_settings().tiles_coverage_enabled:
+        return {}
+    return _tile_coverage.get(dataset) or {}
+
+
+def _sync_tile_archives(version_dir: Path, version: str) -> None:
+    """Download the version's archives from S3 that are not on disk yet."""
+    settings = get_settings()
+    bucket = settings.tiles_archive_s3_bucket
+    prefix = f"{settings.tiles_archive_s3_prefix.strip('/')}/{version}/"
+    s3 = get_s3()
+
+    version_dir.mkdir(parents=True, exist_ok=True)
+    for obj in iter_objects(s3, bucket, prefix):
+        name = obj["Key"].removeprefix(prefix)
+        target = version_dir / name
+        if "/" in name or not name.endswith(".mbtiles") or target.exists():
+            continue
+        # other workers on this host may be fetching the same file: each
+        # downloads beside it and renames into place, so none ever opens a
+        # partial archive
+        fd, part = tempfile.mkstemp(dir=version_dir, suffix=".part")
+        os.close(fd)
+        try:
+            s3.download_file(bucket, obj["Key"], part)
+            os.replace(part, target)
+        finally:
+            Path(part).unlink(missing_ok=True)
+        logger.info(
+            "Tile archive downloaded",
+            extra={"bucket": bucket, "key": obj["Key"], "path": str(target)},
+        )
+
+
+def _load_tile_archives(db: Session) -> dict[str, MBTilesReader]:
+    """
+    Open the live dataset version's archives under `tiles_archive_dir`,
+    fetching them from S3 first when a bucket is configured.
+    """
+    settings = get_settings()
+    dataset = ReadQueries(db).dataset_version()
+    if not settings.tiles_archive_dir or dataset is None:
+        return {}
+
+    version = dataset["version"]
+    root = Path(settings.tiles_archive_dir)
+    if settings.tiles_archive_s3_bucket:
+        _sync_tile_archives(root / version, version)
+        # versions sort by load time; other workers may still be serving
+        # the previous one, so only those before it are removed
+        for old in sorted(p for p in root.iterdir() if p.is_dir())[:-2]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    archives: dict[str, MBTilesReader] = {}
+    for path in sorted((root / version).glob("*.mbtiles")):
+        reader = MBTilesReader(path)
+        if reader.version != version:
+            logger.warning(
+                "Tile archive skipped, stamped with another dataset version",
+                extra={"path": str(path), "archive_version": reader.version},
+            )
+            continue
+        archives[path.stem] = reader
+        logger.info(
+            "Tile archive loaded",
+            extra={
+                "layer": path.stem,
+                "path": str(path),
+                "version": version,
+                "min_zoom": reader.min_zoom,
+                "max_zoom": reader.max_zoom,
+            },
+        )
+    return archives
+
+
+_tile_archives = PerDatasetVersion("tile_archives", _load_tile_archives)
+
+
+def get_tile_archives(
+    dataset: RowMapping | None = Depends(get_dataset_version),
+) -> dict[str, MBTilesReader]:
+    """
+    Tile archives of the live dataset version by layer. Empty while they
+    load, or when none match the version, so tiles come from Redis or
+    PostGIS instead of a previous version's archive.
+    """
+    if dataset is None or not get_settings().tiles_archive_dir:
+        return {}
+    archives = _tile_archives.get(dataset) or {}
+    return {
+        layer: archive
+        for layer, archive in archives.items()
+        if archive.version == dataset["version"]
+    }
+
+
+def _load_places_index(db: Session) -> PlacesIndex:
+    return PlacesIndex(ReadQueries(db).place_points())
+
+
+_places_index = PerDatasetVersion("places", _load_places_index)
+
+
+def get_places_index(
+    dataset: RowMapping | None = Depends(get_dataset_version),
+) -> PlacesIndex | None:
+    """Nearest-place KD-tree, or None to fall back to PostGIS."""
+    if not get_settings().places_index_enabled:
+        return None
+    return _places_index.get(dataset)
+
+
+def _load_reverse_index(db: Session) -> ReverseIndex:
+    rq = ReadQueries(db)
+    return ReverseIndex({layer: rq.layer_polygons(layer) for layer in REVERSE_MODELS})
+
+
+_reverse_index = PerDatasetVersion("reverse", _load_reverse_index)
+
+
+def get_reverse_index(
+    dataset: RowMapping | None = Depends(get_dataset_version),
+) -> ReverseIndex | None:
+    """Point-in-polygon STRtrees, or None to fall back to PostGIS."""
+    if not get_settings().reverse_index_enabled:
+        return None
+    return _reverse_index.get(dataset)
+
+
+def _load_reverse_cells(db: Session) -> ReverseCells:
+    rq = ReadQueries(db)
+    levels = {layer: rq.reverse_cells(layer) for layer in REVERSE_MODELS}
+    names = {layer: rq.layer_names(layer) for layer in REVERSE_MODELS if levels[layer]}
+    return ReverseCells(levels, names)
+
+
+_reverse_cells = PerDatasetVersion("reverse_cells", _load_reverse_cells)
+
+
+def get_reverse_cells(
+    dataset: RowMapping | None = Depends(get_dataset_version),
+) -> ReverseCells | None:
+    """ETL-built interior cells, or None to run every point through polygons."""
+    if not get_settings().reverse_cells_enabled:
+        return None
+    cells = _reverse_cells.get(dataset)
+    return cells if cells is not None and cells.layers else None
@@ -0,0 +1,60 @@
+"""
+Conditional-GET helpers. Validators derive from the dataset version, so a
+304 can be answered before any Redis or PostGIS work.
+"""
+
+import hashlib
+from datetime import timezone
+from email.utils import format_datetime
+
+from fastapi import Request, Response, status
+from sqlalchemy.engine import RowMapping
+
+
+def make_etag(dataset: RowMapping, *parts: object) -> str:
+    """
+    Weak ETag for one resource of one dataset version. Weak because the
+    identity, gzip, br and zstd bodies of a resource share it.
+    """
+    raw = "|".join(str(p) for p in (dataset["version"], *parts))
+    return 'W/"' + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest() + '"'
+
+
+def cache_headers(dataset: RowMapping, etag: str, cache_control: str) -> dict:
+    return {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        "Last-Modified": format_datetime(
+            dataset["loaded_at"].astimezone(timezone.utc), usegmt=True
+        ),
+        "Cache-Control": cache_control,
+    }
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already holds `etag`."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def encoded_response(
+    content: bytes, media_type: str, encoding: str | None, headers: dict
+) -> Response:
+    """
+    Response for a body that is already compressed with `encoding`; the
+    Content-Encoding header also makes GZipMiddleware pass it through.
+    """
+    headers = {**headers, "Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type=media_type, headers=headers)
@@ -1,5 +1,4 @@
 from fastapi import FastAPI
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
@@ -9,7 +8,7 @@ from starlette.requests import Request
 from starlette.responses import Response
 
 from .settings import get_settings
-from .routers import health, places, reverse, quickfacts, tiles
+from .routers import health, jobs, places, reverse, quickfacts, tiles
 from .middleware.error_handler import (
     APIError,
     api_error_handler,
@@ -19,6 +18,7 @@ from .middleware.error_handler import (
 )
 from .middleware.request_id import RequestContextMiddleware
 from .middleware.rate_limit import RateLimitMiddleware
+from .middleware.gzip import SelectiveGZipMiddleware
 from .logging_config import setup_logging
 from .deps import get_cache
 
@@ -43,7 +43,12 @@ app.add_exception_handler(SQLAlchemyError, sqlalchemy_error_handler)  # type: ig
 app.add_exception_handler(Exception, generic_error_handler)  # type: ignore
 
 # ---- middleware ---- #
-app.add_middleware(GZipMiddleware, minimum_size=500)
+# Tiles and QuickFacts send pre-compressed bodies with Content-Encoding
+# set, which GZipMiddleware passes through; it only compresses other routes.
+# The tile batch stream is left as-is rather than gzipped on every request
+app.add_middleware(
+    SelectiveGZipMiddleware, minimum_size=500, exclude_paths=("/v1/tiles:batch",)
+)
 app.add_middleware(RequestContextMiddleware)
 
 # Setup rate limiting
@@ -57,7 +62,7 @@ if settings.cors_allow_origins:
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_allow_origins.split(","),
-        allow_methods=["GET"],
+        allow_methods=["GET", "POST"],
         allow_headers=["*"],
     )
 
@@ -68,5 +73,6 @@ for r in (
     reverse.router,
     quickfacts.router,
     tiles.router,
+    jobs.router,
 ):
     app.include_router(r)
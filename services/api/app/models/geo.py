@@ -1,9 +1,11 @@
-from typing import Literal, Sequence
+from datetime import datetime
+from typing import Literal, Sequence, get_args
 
 from pydantic import BaseModel, Field
 
 
 LayerLiteral = Literal["states", "counties", "msas", "places"]
+LAYERS: tuple[str, ...] = get_args(LayerLiteral)
 
 
 class NearbyPlace(BaseModel):
@@ -18,6 +20,28 @@ class NearbyResponse(BaseModel):
     results: Sequence[NearbyPlace]
 
 
+class NearbyPoint(BaseModel):
+    lat: float = Field(..., ge=-90.0, le=90.0)
+    lon: float = Field(..., ge=-180.0, le=180.0)
+
+
+class NearbyBatchRequest(BaseModel):
+    points: list[NearbyPoint] = Field(..., min_length=1, max_length=5000)
+    radius_km: int | None = Field(None, gt=0, le=500)
+    limit: int = Field(25, gt=0, le=100)
+    mode: Literal["radius", "knn"] = "radius"
+
+
+class NearbyBatchResponse(BaseModel):
+    # one result list per request point, in request order
+    results: Sequence[Sequence[NearbyPlace]]
+
+
+class ReverseState(BaseModel):
+    geoid: str
+    name: str
+
+
 class ReverseCounty(BaseModel):
     geoid: str
     name: str
@@ -28,6 +52,62 @@ class ReverseMSA(BaseModel):
     name: str
 
 
+class ReversePlace(BaseModel):
+    geoid: str
+    name: str
+
+
 class ReverseResponse(BaseModel):
+    state: ReverseState | None = None
     county: ReverseCounty | None = None
     msa: ReverseMSA | None = None
+    place: ReversePlace | None = None
+
+
+class BatchTile(BaseModel):
+    layer: str = Field(..., description="Layer name or comma-separated layers")
+    z: int = Field(..., ge=0, le=22)
+    x: int = Field(..., ge=0)
+    y: int = Field(..., ge=0)
+
+
+class TileBatchRequest(BaseModel):
+    tiles: list[BatchTile] = Field(..., min_length=1, max_length=256)
+    simplify: int = Field(0, ge=0, le=8)
+    facts: list[str] = Field(default_factory=list)
+
+
+class QuickFactsRef(BaseModel):
+    layer: LayerLiteral
+    geoid: str = Field(..., min_length=2, max_length=7)
+
+
+class QuickFactsBatchRequest(BaseModel):
+    items: list[QuickFactsRef] = Field(..., min_length=1, max_length=500)
+
+
+class GeocodeJobRequest(BaseModel):
+    input_key: str = Field(
+        ...,
+        min_length=1,
+        description="S3 key of the input file, under {jobs_s3_prefix}/input/",
+    )
+    # inferred from the key's extension when omitted
+    format: Literal["csv", "parquet"] | None = None
+    lat_column: str = "lat"
+    lon_column: str = "lon"
+
+
+class GeocodeJobResponse(BaseModel):
+    id: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    input_key: str
+    format: Literal["csv", "parquet"]
+    rows_done: int
+    output_key: str | None = None
+    # presigned GET URL for the output, once succeeded
+    output_url: str | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
@@ -0,0 +1,54 @@
+"""
+Opt-in Redis cache for point lookups (nearby places, reverse geocoding).
+
+Coordinates are snapped to a grid of `geo_cache_precision` decimal places
+before the lookup runs, so near-identical requests share a key and the
+cached answer is exactly the one computed for that key. Keys carry the
+dataset version, so a new ETL load never serves stale results.
+"""
+
+from typing import Callable, TypeVar
+
+from sqlalchemy.engine import RowMapping
+from tsg_common.cache import Cache
+
+from app.settings import get_settings
+
+T = TypeVar("T")
+
+
+def cached_point_lookup(
+    cache: Cache,
+    dataset: RowMapping | None,
+    prefix: str,
+    lat: float,
+    lon: float,
+    params: tuple,
+    ttl: int,
+    compute: Callable[[float, float], T],
+) -> T:
+    """
+    Run `compute(lat, lon)` through `Cache.get_or_set` under
+    `{prefix}:{version}:{lat}:{lon}:{params...}`. `compute` must return a
+    JSON-serialisable value. Without a recorded dataset version, or with
+    `geo_cache_enabled` off, it runs on the exact coordinates uncached.
+    """
+    settings = get_settings()
+    if not settings.geo_cache_enabled or dataset is None:
+        return compute(lat, lon)
+
+    precision = settings.geo_cache_precision
+    # `+ 0.0` folds -0.0 into 0.0 so both sides of the meridian share a key
+    lat = round(lat, precision) + 0.0
+    lon = round(lon, precision) + 0.0
+    key = ":".join(
+        str(p)
+        for p in (
+            prefix,
+            dataset["version"],
+            f"{lat:.{precision}f}",
+            f"{lon:.{precision}f}",
+            *params,
+        )
+    )
+    return cache.get_or_set(key, ttl, lambda: compute(lat, lon))
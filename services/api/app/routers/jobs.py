@@ -0,0 +1,119 @@
+from pathlib import PurePosixPath
+from uuid import uuid4
+import logging
+
+from fastapi import APIRouter, Depends, Path, Response
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.orm import Session
+from tsg_common.db import ReadQueries, WriteQueries
+from tsg_common.s3_utils import object_exists, presigned_url
+
+from app.deps import get_db, get_s3
+from app.models.geo import GeocodeJobRequest, GeocodeJobResponse
+from app.middleware.error_handler import APIError
+from app.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/v1", tags=["jobs"])
+
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+
+def _job_response(job: RowMapping, s3) -> dict:
+    settings = get_settings()
+    out = dict(job)
+    out["output_url"] = None
+    if job["status"] == "succeeded" and job["output_key"]:
+        out["output_url"] = presigned_url(
+            s3, settings.jobs_s3_bucket, job["output_key"], settings.jobs_url_ttl
+        )
+    return out
+
+
+def _check_input_key(key: str) -> None:
+    """
+    Inputs must be uploaded under `{jobs_s3_prefix}/input/`: a job copies
+    every input column into an output anyone with the job id can download,
+    so it must not be able to read other objects in the bucket.
+    """
+    input_prefix = f"{get_settings().jobs_s3_prefix.strip('/')}/input/"
+    segments = key.split("/")
+    if (
+        not key.startswith(input_prefix)
+        or key == input_prefix
+        or any(s in ("", ".", "..") for s in segments)
+    ):
+        raise APIError(
+            message="Invalid input key",
+            status_code=400,
+            details={"input_key": key, "prefix": input_prefix},
+        )
+
+
+def _jobs_bucket() -> str:
+    bucket = get_settings().jobs_s3_bucket
+    if not bucket:
+        raise APIError(
+            message="Bulk geocoding jobs are not enabled",
+            status_code=503,
+        )
+    return bucket
+
+
+@router.post("/geocode/jobs", response_model=GeocodeJobResponse, status_code=202)
+def submit_geocode_job(
+    body: GeocodeJobRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    s3=Depends(get_s3),
+):
+    """
+    Queue a bulk reverse geocoding job over a CSV or Parquet file already
+    uploaded to the jobs bucket. A `geocode-worker` appends county, MSA,
+    place and nearest-place columns and writes the result back to S3; poll
+    the returned job for its status and output URL.
+    """
+    bucket = _jobs_bucket()
+    _check_input_key(body.input_key)
+
+    fmt = body.format or FORMATS.get(PurePosixPath(body.input_key).suffix.lower())
+    if fmt is None:
+        raise APIError(
+            message="Cannot infer input format",
+            status_code=400,
+            details={"input_key": body.input_key, "allowed": ["csv", "parquet"]},
+        )
+    if not object_exists(s3, bucket, body.input_key):
+        raise APIError(
+            message="Input file not found",
+            status_code=400,
+            details={"bucket": bucket, "input_key": body.input_key},
+        )
+
+    job = WriteQueries(db).create_geocode_job(
+        uuid4().hex, body.input_key, fmt, body.lat_column, body.lon_column
+    )
+    logger.info(
+        "Geocoding job queued",
+        extra={"job_id": job["id"], "input_key": body.input_key, "format": fmt},
+    )
+    response.headers["Location"] = f"/v1/geocode/jobs/{job['id']}"
+    return _job_response(job, s3)
+
+
+@router.get("/geocode/jobs/{job_id}", response_model=GeocodeJobResponse)
+def get_geocode_job(
+    job_id: str = Path(..., min_length=1, max_length=64),
+    db: Session = Depends(get_db),
+    s3=Depends(get_s3),
+):
+    _jobs_bucket()
+    job = ReadQueries(db).geocode_job(job_id)
+    if job is None:
+        raise APIError(
+            message="Geocoding job not found",
+            status_code=404,
+            details={"job_id": job_id},
+        )
+    return _job_response(job, s3)
@@ -1,16 +1,30 @@
+from typing import Literal
+
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.orm import Session
+from tsg_common.cache import Cache
 from tsg_common.db import ReadQueries
 import logging
 
-from app.deps import get_db
-from app.models.geo import NearbyPlace, NearbyResponse
+from app.deps import get_db, get_cache, get_dataset_version, get_places_index
+from app.models.geo import (
+    NearbyPlace,
+    NearbyResponse,
+    NearbyBatchRequest,
+    NearbyBatchResponse,
+)
+from app.spatial import PlacesIndex
 from app.middleware.error_handler import APIError
+from app.result_cache import cached_point_lookup
+from app.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v1", tags=["places"])
 
+DEFAULT_RADIUS_KM = 50
+
 
 @router.get("/places/nearby", response_model=NearbyResponse)
 def nearby(
@@ -20,13 +34,25 @@ def nearby(
     lon: float = Query(
         ..., ge=-180.0, le=180.0, description="Longitude between -180 and 180"
     ),
-    radius_km: int = Query(
-        50, gt=0, le=500, description="Search radius in kilometers (1-500)"
+    radius_km: int | None = Query(
+        None,
+        gt=0,
+        le=500,
+        description="Search radius in kilometers (1-500); 50 if omitted in "
+        "radius mode, unbounded if omitted in knn mode",
     ),
     limit: int = Query(
         25, gt=0, le=100, description="Maximum number of results (1-100)"
     ),
+    mode: Literal["radius", "knn"] = Query(
+        "radius",
+        description="radius: everything within radius_km, nearest first; "
+        "knn: the `limit` nearest places, bounded cost at any density",
+    ),
     db: Session = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+    dataset: RowMapping | None = Depends(get_dataset_version),
+    index: PlacesIndex | None = Depends(get_places_index),
 ):
     try:
         logger.info(
@@ -36,10 +62,31 @@ def nearby(
                 "lon": lon,
                 "radius_km": radius_km,
                 "limit": limit,
+                "mode": mode,
             },
         )
 
-        results = ReadQueries(db).nearby_places(lat, lon, radius_km, limit)
+        source = index if index is not None else ReadQueries(db)
+        if mode == "radius":
+            radius_km = radius_km or DEFAULT_RADIUS_KM
+
+        def lookup(lat: float, lon: float) -> list[dict]:
+            if mode == "knn":
+                rows = source.nearest_places(lat, lon, limit, radius_km)
+            else:
+                rows = source.nearby_places(lat, lon, radius_km, limit)
+            return [dict(r) for r in rows]
+
+        results = cached_point_lookup(
+            cache,
+            dataset,
+            "nearby",
+            lat,
+            lon,
+            (radius_km, limit, mode),
+            get_settings().nearby_cache_ttl,
+            lookup,
+        )
         if not results:
             logger.info(
                 "No places found in radius",
@@ -69,3 +116,57 @@ def nearby(
             message="Internal server error processing nearby places request",
             status_code=500,
         )
+
+
+@router.post("/places/nearby:batch", response_model=NearbyBatchResponse)
+def nearby_batch(
+    body: NearbyBatchRequest,
+    db: Session = Depends(get_db),
+    index: PlacesIndex | None = Depends(get_places_index),
+):
+    """
+    `/places/nearby` for up to 5000 points in one call, resolved in one
+    vectorised KD-tree query (or one LATERAL SQL statement as fallback).
+    """
+    radius_km = body.radius_km
+    if body.mode == "radius":
+        radius_km = radius_km or DEFAULT_RADIUS_KM
+    points = [(p.lat, p.lon) for p in body.points]
+
+    try:
+        logger.info(
+            "Processing nearby places batch request",
+            extra={
+                "points": len(points),
+                "radius_km": radius_km,
+                "limit": body.limit,
+                "mode": body.mode,
+            },
+        )
+
+        if index is not None:
+            results = index.nearest_places_many(points, body.limit, radius_km)
+        else:
+            results = ReadQueries(db).nearest_places_many(
+                points, body.limit, radius_km, knn=body.mode == "knn"
+            )
+
+        return NearbyBatchResponse(
+            results=[[NearbyPlace(**r) for r in rows] for rows in results]
+        )
+
+    except Exception as e:
+        logger.error(
+            "Error processing nearby places batch request",
+            extra={
+                "error": str(e),
+                "points": len(points),
+                "radius_km": radius_km,
+                "limit": body.limit,
+            },
+            exc_info=True,
+        )
+        raise APIError(
+            message="Internal server error processing nearby places batch request",
+            status_code=500,
+        )
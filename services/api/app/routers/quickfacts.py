@@ -1,29 +1,106 @@
-from fastapi import APIRouter, Depends, Path, HTTPException
+from fastapi import APIRouter, Depends, Path, HTTPException, Request, Response
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.orm import Session
-from tsg_common.cache import Cache
+from tsg_common.cache import Cache, JSON_dumps
+from tsg_common.cache.compression import negotiate
 from tsg_common.db import ReadQueries
-from app.deps import get_db, get_cache
-from app.models.geo import LayerLiteral
+from app.deps import get_db, get_cache, get_dataset_version
+from app.http_cache import (
+    make_etag,
+    cache_headers,
+    is_not_modified,
+    not_modified,
+    encoded_response,
+)
+from app.models.geo import LayerLiteral, QuickFactsBatchRequest
 from app.settings import get_settings
 
 router = APIRouter(prefix="/v1", tags=["quickfacts"])
 
 
+def _key(layer: str, geoid: str) -> str:
+    # `v2`: entries are spliced into responses verbatim, and the earlier
+    # `qf:{layer}:{geoid}` entries may hold a cached `null`
+    return f"qf:v2:{layer}:{geoid}"
+
+
 @router.get("/quickfacts/{layer}/{geoid}")
 def quickfacts(
+    request: Request,
     layer: LayerLiteral = Path(..., description="states|counties|places"),
     geoid: str = Path(..., min_length=2, max_length=7),
     db: Session = Depends(get_db),
     cache: Cache = Depends(get_cache),
+    dataset: RowMapping | None = Depends(get_dataset_version),
 ):
-    key = f"qf:{layer}:{geoid}"
+    key = _key(layer, geoid)
     settings = get_settings()
 
-    data = cache.get_or_set(
-        key,
-        settings.quickfacts_cache_ttl,
-        lambda: ReadQueries(db).get_quickfacts(layer, geoid),
-    )
+    headers: dict = {}
+    if dataset is not None:
+        etag = make_etag(dataset, "quickfacts", layer, geoid)
+        headers = cache_headers(dataset, etag, settings.quickfacts_cache_control)
+        if is_not_modified(request, etag):
+            return not_modified(headers)
+
+    # the cached value is the serialised JSON, so hits (and their
+    # pre-compressed variants) go out without re-encoding
+    encoding = negotiate(request.headers.get("Accept-Encoding"))
+    data = cache.get_encoded(key, encoding)
     if data is None:
-        raise HTTPException(status_code=404, detail="QuickFacts not found")
-    return data
+        facts = ReadQueries(db).get_quickfacts(layer, geoid)
+        if facts is None:
+            raise HTTPException(status_code=404, detail="QuickFacts not found")
+        variants = cache.set_encoded(
+            key, JSON_dumps(facts), settings.quickfacts_cache_ttl
+        )
+        data = variants[encoding]
+
+    return encoded_response(data, "application/json", encoding, headers)
+
+
+@router.post("/quickfacts:batch")
+def quickfacts_batch(
+    body: QuickFactsBatchRequest,
+    db: Session = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+):
+    """
+    QuickFacts for up to 500 (layer, geoid) pairs as
+    `{"results": {layer: {geoid: facts | null}}}`. Cache hits come from one
+    MGET, misses from one `(layer, geoid) IN (...)` query, and the misses
+    are cached again (uncompressed) in one pipeline.
+    """
+    pairs = list(dict.fromkeys((ref.layer, ref.geoid) for ref in body.items))
+    keys = [_key(layer, geoid) for layer, geoid in pairs]
+
+    found: dict[tuple[str, str], bytes] = {}
+    misses: list[tuple[str, str]] = []
+    for pair, data in zip(pairs, cache.mget_raw(keys)):
+        if data is None:
+            misses.append(pair)
+        else:
+            found[pair] = data
+
+    if misses:
+        facts = ReadQueries(db).get_quickfacts_many(misses)
+        fetched = {pair: JSON_dumps(facts[pair]) for pair in misses if pair in facts}
+        # raw JSON only: compressing hundreds of blobs here would stall the
+        # response, and `get_encoded` backfills a variant on its first read
+        cache.set_raw_many(
+            {_key(layer, geoid): data for (layer, geoid), data in fetched.items()},
+            get_settings().quickfacts_cache_ttl,
+        )
+        found.update(fetched)
+
+    # splice the cached JSON in as-is rather than decoding every blob
+    by_layer: dict[str, list[bytes]] = {}
+    for layer, geoid in pairs:
+        by_layer.setdefault(layer, []).append(
+            JSON_dumps(geoid) + b":" + found.get((layer, geoid), b"null")
+        )
+    results = b",".join(
+        JSON_dumps(layer) + b":{" + b",".join(entries) + b"}"
+        for layer, entries in by_layer.items()
+    )
+    return Response(b'{"results":{' + results + b"}}", media_type="application/json")
@@ -1,16 +1,52 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.orm import Session
+from tsg_common.cache import Cache, JSON_dumps, JSON_loads
 from tsg_common.db import ReadQueries
+from tsg_common.db.read_queries import REVERSE_MODELS
 import logging
 
-from app.deps import get_db
+import numpy as np
+
+from app.deps import (
+    get_db,
+    get_cache,
+    get_dataset_version,
+    get_reverse_cells,
+    get_reverse_index,
+)
 from app.models.geo import ReverseResponse
 from app.middleware.error_handler import APIError
+from app.spatial import ReverseCells, ReverseIndex
+from app.result_cache import cached_point_lookup
+from app.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v1", tags=["reverse"])
 
+MAX_BATCH_POINTS = 100_000
+# NDJSON lines per streamed chunk
+BATCH_CHUNK_LINES = 1000
+
+
+def _reverse_many(
+    points,
+    layers: tuple[str, ...],
+    db: Session,
+    index: ReverseIndex | None,
+    cells: ReverseCells | None,
+) -> list[dict]:
+    """
+    Interior-cell lookup first when built, then the STRtree index, then
+    PostGIS for whatever is left.
+    """
+    source = index if index is not None else ReadQueries(db)
+    if cells is None:
+        return source.reverse_lookup_many(points, layers)
+    return cells.reverse_lookup_many(points, layers, source)
+
 
 @router.get("/reverse", response_model=ReverseResponse)
 def reverse_lookup(
@@ -22,10 +58,15 @@ def reverse_lookup(
     ),
     layers: str = Query(
         "counties,msas",
-        description="Comma-separated list of layers to search (counties,msas)",
+        description="Comma-separated list of layers to search "
+        "(states,counties,msas,places)",
         pattern="^[a-z,]+$",
     ),
     db: Session = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+    dataset: RowMapping | None = Depends(get_dataset_version),
+    index: ReverseIndex | None = Depends(get_reverse_index),
+    cells: ReverseCells | None = Depends(get_reverse_cells),
 ):
     try:
         logger.info(
@@ -45,8 +86,23 @@ def reverse_lookup(
                 details={"layers": "Must specify at least one layer"},
             )
 
-        result = ReadQueries(db).reverse_lookup(lat, lon, layer_tuple)
-        if not any(getattr(result, layer, None) for layer in ("county", "msa")):
+        def lookup(lat: float, lon: float) -> dict:
+            found = _reverse_many([(lat, lon)], layer_tuple, db, index, cells)[0]
+            return {
+                key: None if row is None else dict(row) for key, row in found.items()
+            }
+
+        result = cached_point_lookup(
+            cache,
+            dataset,
+            "rev",
+            lat,
+            lon,
+            (",".join(sorted(set(layer_tuple))),),
+            get_settings().reverse_cache_ttl,
+            lookup,
+        )
+        if not any(result.values()):
             logger.info(
                 "No results found for location",
                 extra={
@@ -75,3 +131,103 @@ def reverse_lookup(
             message="Internal server error processing reverse geocoding request",
             status_code=500,
         )
+
+
+async def _batch_points(request: Request) -> np.ndarray:
+    """
+    (n, 2) float64 array of (lat, lon) from either `{"points": [[lat, lon],
+    ...]}` or, with `Content-Type: application/octet-stream`, packed
+    little-endian float64 lat, lon pairs.
+    """
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith(
+            "application/octet-stream"
+        ):
+            if len(body) % 16:
+                raise ValueError("buffer length must be a multiple of 16 bytes")
+            points = np.frombuffer(body, dtype="<f8").reshape(-1, 2)
+        else:
+            points = np.asarray(JSON_loads(body)["points"], dtype=float)
+            if points.ndim != 2 or points.shape[1] != 2:
+                raise ValueError("points must be [lat, lon] pairs")
+    except (ValueError, TypeError, KeyError) as e:
+        raise APIError(
+            message="Malformed reverse batch body",
+            status_code=400,
+            details={"body": str(e)},
+        )
+
+    if not 0 < len(points) <= MAX_BATCH_POINTS:
+        raise APIError(
+            message="Invalid number of points",
+            status_code=400,
+            details={"points": len(points), "max": MAX_BATCH_POINTS},
+        )
+    # NaN fails both comparisons, so it is rejected too
+    bad = ~((np.abs(points[:, 0]) <= 90.0) & (np.abs(points[:, 1]) <= 180.0))
+    if bad.any():
+        raise APIError(
+            message="Coordinates out of range",
+            status_code=400,
+            details={"index": int(np.argmax(bad))},
+        )
+    return points
+
+
+@router.post("/reverse:batch")
+def reverse_lookup_batch(
+    layers: str = Query(
+        "states,counties,msas",
+        description="Comma-separated list of layers to search "
+        "(states,counties,msas,places)",
+        pattern="^[a-z,]+$",
+    ),
+    points: np.ndarray = Depends(_batch_points),
+    db: Session = Depends(get_db),
+    index: ReverseIndex | None = Depends(get_reverse_index),
+    cells: ReverseCells | None = Depends(get_reverse_cells),
+):
+    """
+    `/reverse` for up to 100k points, streamed back as NDJSON: one line per
+    point, in request order. Resolved in one vectorised STRtree pass (or one
+    SQL statement over unnested point arrays as fallback).
+    """
+    requested = set(filter(None, layers.split(",")))
+    unknown = requested - set(REVERSE_MODELS)
+    if not requested or unknown:
+        raise APIError(
+            message="Unknown reverse layer",
+            status_code=422,
+            details={"layers": sorted(unknown), "allowed": list(REVERSE_MODELS)},
+        )
+    layer_tuple = tuple(requested)
+
+    try:
+        logger.info(
+            "Processing reverse geocoding batch request",
+            extra={"points": len(points), "layers": layers},
+        )
+
+        results = _reverse_many(points, layer_tuple, db, index, cells)
+
+    except Exception as e:
+        logger.error(
+            "Error processing reverse geocoding batch request",
+            extra={"error": str(e), "points": len(points), "layers": layers},
+            exc_info=True,
+        )
+        raise APIError(
+            message="Internal server error processing reverse geocoding batch "
+            "request",
+            status_code=500,
+        )
+
+    def lines():
+        for start in range(0, len(results), BATCH_CHUNK_LINES):
+            yield b"".join(
+                JSON_dumps(r) + b"\n"
+                for r in results[start : start + BATCH_CHUNK_LINES]
+            )
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,11 +1,34 @@
-from fastapi import APIRouter, Depends, Path, Query, Response
+from fastapi import APIRouter, Depends, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.orm import Session
 from tsg_common.cache import Cache
+from tsg_common.cache.compression import negotiate
 from tsg_common.db import ReadQueries
+from tsg_common.tiles import tile_key
+from tsg_common.tiles.coverage import CoverageIndex
+from tsg_common.tiles.mbtiles import MBTilesReader
+from tsg_common.tiles.mvt import overzoom
+from tsg_common.tiles.render import fit_budget, render_tile, renderer
+import gzip
 import logging
+import struct
 
-from app.deps import get_db, get_cache
-from app.models.geo import LayerLiteral
+from app.deps import (
+    get_db,
+    get_cache,
+    get_tile_archives,
+    get_dataset_version,
+    get_tile_coverage,
+)
+from app.http_cache import (
+    make_etag,
+    cache_headers,
+    is_not_modified,
+    not_modified,
+    encoded_response,
+)
+from app.models.geo import LAYERS, TileBatchRequest
 from app.middleware.error_handler import APIError
 from app.settings import get_settings
 
@@ -13,21 +36,142 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/v1", tags=["tiles"])
 
+# (layers, z, x, y) of one tile to load
+TileRef = tuple[tuple[str, ...], int, int, int]
+
+# QuickFacts fields a tile may embed, and property names they can't shadow
+MAX_TILE_FACTS = 16
+RESERVED_PROPERTIES = frozenset({"geoid", "name", "geom", "point_count"})
+
+
+def _parse_layers(layer: str) -> list[str]:
+    """
+    Split a `states,counties` path segment into known layers, de-duplicated
+    and in canonical order so equivalent requests share one cache key.
+    """
+    requested = set(filter(None, layer.split(",")))
+    unknown = requested - set(LAYERS)
+    if not requested or unknown:
+        raise APIError(
+            message="Unknown tile layer",
+            status_code=422,
+            details={"layers": sorted(unknown), "allowed": list(LAYERS)},
+        )
+    return [name for name in LAYERS if name in requested]
+
+
+def _parse_facts(facts: list[str]) -> tuple[str, ...]:
+    """
+    De-duplicate and sort requested QuickFacts fields so equivalent requests
+    share one cache key. Names may contain commas, hence repeated params.
+    """
+    fields = tuple(sorted(set(filter(None, facts))))
+    reserved = RESERVED_PROPERTIES.intersection(fields)
+    if len(fields) > MAX_TILE_FACTS or reserved:
+        raise APIError(
+            message="Invalid QuickFacts fields for tile",
+            status_code=422,
+            details={"max_fields": MAX_TILE_FACTS, "reserved": sorted(reserved)},
+        )
+    return fields
+
+
+def _load_tile(
+    layers: list[str],
+    z: int,
+    x: int,
+    y: int,
+    ext: str,
+    simplify: int,
+    facts: tuple[str, ...],
+    accept_encoding: str | None,
+    db: Session,
+    cache: Cache,
+    archives: dict[str, MBTilesReader],
+) -> tuple[bytes | None, str | None]:
+    """
+    Tile bytes from the archive, Redis or PostGIS (in that order), encoded
+    as `accept_encoding` allows. Returns (None, None) for an empty tile.
+    """
+    layer = ",".join(layers)
+
+    # Pre-built archive is authoritative for everything it covers: a
+    # missing row there is an empty tile, not a reason to hit PostGIS
+    archive = (
+        archives.get(layer) if ext == "mvt" and not simplify and not facts else None
+    )
+    if archive is not None and archive.covers(z, x, y):
+        data = archive.get_tile_gzip(z, x, y)
+        if data is None:
+            return None, None
+        # archive blobs are stored gzipped
+        if negotiate(accept_encoding, ("gzip",)):
+            return data, "gzip"
+        return gzip.decompress(data), None
+
+    encoding = negotiate(accept_encoding)
+    key = tile_key(layer, z, x, y, ext, simplify, facts)
+    data = cache.get_encoded(key, encoding)
+    if data is not None:
+        return data, encoding
+
+    logger.info(
+        "Cache miss for tile",
+        extra={
+            "layer": layer,
+            "z": z,
+            "x": x,
+            "y": y,
+            "ext": ext,
+        },
+    )
+    tile = render_tile(
+        ReadQueries(db),
+        layers,
+        z,
+        x,
+        y,
+        ext,
+        simplify,
+        facts,
+        get_settings().tiles_max_bytes,
+        cache,
+    )
+    if tile is None:
+        return None, None
+    raw = tile if isinstance(tile, (bytes, bytearray)) else str(tile).encode()
+    variants = cache.set_encoded(key, raw, ttl=get_settings().tiles_cache_ttl)
+    return variants[encoding], encoding
+
 
 @router.get("/tiles/{layer}/{z}/{x}/{y}.{ext}")
 def vector_tile(
-    layer: LayerLiteral,
+    request: Request,
+    layer: str = Path(
+        ...,
+        description="Layer name, or comma-separated layers for one composite MVT",
+    ),
     z: int = Path(..., ge=0, le=22, description="Zoom level between 0 and 22"),
     x: int = Path(..., ge=0, description="X coordinate (must be non-negative)"),
     y: int = Path(..., ge=0, description="Y coordinate (must be non-negative)"),
     ext: str = Path(
         ..., pattern="^(mvt|geojson)$", description="File extension (mvt or geojson)"
     ),
-    simplify: int | None = Query(
-        None, ge=0, description="Simplification factor (optional)"
+    simplify: int = Query(
+        0,
+        ge=0,
+        le=8,
+        description="Render from generalised geometry this many zooms coarser",
+    ),
+    facts: list[str] = Query(
+        [],
+        description="QuickFacts field to add as a feature property (repeatable)",
     ),
     db: Session = Depends(get_db),
     cache: Cache = Depends(get_cache),
+    archives: dict[str, MBTilesReader] = Depends(get_tile_archives),
+    dataset: RowMapping | None = Depends(get_dataset_version),
+    coverage: dict[str, CoverageIndex] = Depends(get_tile_coverage),
 ):
     try:
         # content-type
@@ -37,6 +181,16 @@ def vector_tile(
             else "application/geo+json"
         )
 
+        layers = _parse_layers(layer)
+        if len(layers) > 1 and ext != "mvt":
+            raise APIError(
+                message="Composite tiles are only available as mvt",
+                status_code=400,
+                details={"layers": layers, "ext": ext},
+            )
+        layer = ",".join(layers)
+        fields = _parse_facts(facts)
+
         # Validate tile coordinates at zoom level
         max_tile = 2**z - 1
         if x > max_tile or y > max_tile:
@@ -60,31 +214,68 @@ def vector_tile(
                 },
             )
 
-        key = f"tile:{layer}:{z}:{x}:{y}:{ext}"
-        data = cache.get_raw(key)
+        headers: dict = {}
+        if dataset is not None:
+            etag = make_etag(dataset, "tile", layer, z, x, y, ext, simplify, *fields)
+            headers = cache_headers(dataset, etag, get_settings().tiles_cache_control)
+            if is_not_modified(request, etag):
+                return not_modified(headers)
 
-        if data is None:
-            logger.info(
-                "Cache miss for tile",
-                extra={
-                    "layer": layer,
-                    "z": z,
-                    "x": x,
-                    "y": y,
-                    "ext": ext,
-                },
+        # Known-empty tiles (ocean, outside the US) never reach the archive,
+        # Redis or PostGIS; 204 is cacheable and renders as an empty tile
+        if all(
+            name in coverage and coverage[name].is_empty(z, x, y) for name in layers
+        ):
+            return Response(status_code=status.HTTP_204_NO_CONTENT, headers=headers)
+
+        accept_encoding = request.headers.get("Accept-Encoding")
+
+        # Past the deepest zoom worth rendering, cut the child out of its
+        # ancestor in-process rather than rendering it from PostGIS
+        max_data_zoom = get_settings().tiles_max_data_zoom
+        if ext == "mvt" and max_data_zoom is not None and z > max_data_zoom:
+            encoding = negotiate(accept_encoding)
+            key = tile_key(layer, z, x, y, ext, simplify, fields)
+            data = cache.get_encoded(key, encoding)
+            if data is not None:
+                return encoded_response(data, mime, encoding, headers)
+
+            dz = z - max_data_zoom
+            px, py = x >> dz, y >> dz
+            parent, _ = _load_tile(
+                layers,
+                max_data_zoom,
+                px,
+                py,
+                ext,
+                simplify,
+                fields,
+                None,
+                db,
+                cache,
+                archives,
             )
-            tile = ReadQueries(db).tile_data(layer, z, x, y, format=ext)
-            if tile is None:
+            child = parent and overzoom(parent, dz, x - (px << dz), y - (py << dz))
+            if not child:
                 raise APIError(
                     message="Tile not found",
                     status_code=404,
                 )
-            data = tile if isinstance(tile, (bytes, bytearray)) else str(tile).encode()
-            settings = get_settings()
-            cache.set_raw(key, data, ttl=settings.tiles_cache_ttl)
+            # cached raw; later hits get a stored variant from `get_encoded`,
+            # and only this first response goes through GZipMiddleware
+            cache.set_raw(key, child, get_settings().tiles_cache_ttl)
+            return encoded_response(child, mime, None, headers)
 
-        return Response(content=data, media_type=mime)
+        data, encoding = _load_tile(
+            layers, z, x, y, ext, simplify, fields, accept_encoding, db, cache, archives
+        )
+        if data is None:
+            raise APIError(
+                message="Tile not found",
+                status_code=404,
+            )
+
+        return encoded_response(data, mime, encoding, headers)
 
     except Exception as e:
         if isinstance(e, APIError):
@@ -105,3 +296,132 @@ def vector_tile(
             message="Internal server error processing tile",
             status_code=500,
         )
+
+
+@router.post("/tiles:batch")
+def vector_tile_batch(
+    body: TileBatchRequest,
+    db: Session = Depends(get_db),
+    cache: Cache = Depends(get_cache),
+    archives: dict[str, MBTilesReader] = Depends(get_tile_archives),
+    coverage: dict[str, CoverageIndex] = Depends(get_tile_coverage),
+):
+    """
+    Many mvt tiles in one response, in request order. Each frame is a
+    4-byte big-endian length followed by the tile; length 0 = empty tile.
+    Cache hits come from one MGET and misses render in one SQL statement.
+    """
+    settings = get_settings()
+    simplify = body.simplify
+    fields = _parse_facts(body.facts)
+    max_data_zoom = settings.tiles_max_data_zoom
+
+    # Per requested tile: (source tile, overzoom dz, dx, dy), or None when
+    # known empty. Overzoomed neighbours usually share a source tile.
+    plan: list[tuple[TileRef, int, int, int] | None] = []
+    sources: dict[TileRef, bytes | None] = {}
+    for i, ref in enumerate(body.tiles):
+        layers = tuple(_parse_layers(ref.layer))
+        z, x, y = ref.z, ref.x, ref.y
+        max_tile = 2**z - 1
+        if x > max_tile or y > max_tile:
+            raise APIError(
+                message="Invalid tile coordinates for zoom level",
+                status_code=400,
+                details={"index": i, "max_x": max_tile, "max_y": max_tile, "zoom": z},
+            )
+
+        if all(
+            name in coverage and coverage[name].is_empty(z, x, y) for name in layers
+        ):
+            plan.append(None)
+            continue
+
+        dz = z - max_data_zoom if max_data_zoom is not None else 0
+        if dz > 0:
+            px, py = x >> dz, y >> dz
+            source = (layers, max_data_zoom, px, py)
+            plan.append((source, dz, x - (px << dz), y - (py << dz)))
+        else:
+            source = (layers, z, x, y)
+            plan.append((source, 0, 0, 0))
+        sources[source] = None
+
+    try:
+        # archive first, then one MGET for everything it does not cover
+        pending: list[TileRef] = []
+        for source in sources:
+            layers, z, x, y = source
+            archive = (
+                None if simplify or fields else archives.get(",".join(layers))
+            )
+            if archive is not None and archive.covers(z, x, y):
+                sources[source] = archive.get_tile(z, x, y)
+            else:
+                pending.append(source)
+
+        keys = [
+            tile_key(",".join(layers), z, x, y, "mvt", simplify, fields)
+            for layers, z, x, y in pending
+        ]
+        misses: list[tuple[TileRef, str]] = []
+        for source, key, data in zip(pending, keys, cache.mget_raw(keys)):
+            if data is None:
+                misses.append((source, key))
+            else:
+                sources[source] = data
+
+        if misses:
+            logger.info("Cache misses for tile batch", extra={"misses": len(misses)})
+            rq = ReadQueries(db)
+            rendered = rq.batch_tile_data(
+                [source for source, _ in misses], simplify=simplify, facts=fields
+            )
+            fresh: dict[str, bytes] = {}
+            for (source, key), tile in zip(misses, rendered):
+                if tile is not None:
+                    layers, z, x, y = source
+                    render = renderer(rq, layers, z, x, y, "mvt", fields)
+                    tile = fit_budget(
+                        tile,
+                        layers,
+                        z,
+                        x,
+                        y,
+                        "mvt",
+                        simplify,
+                        render,
+                        settings.tiles_max_bytes,
+                        cache,
+                    )
+                    fresh[key] = tile
+                sources[source] = tile
+            # raw only, in one pipeline: compressing up to 256 tiles here
+            # would hold back the first frame, and `get_encoded` backfills
+            # each variant on its first single-tile read
+            cache.set_raw_many(fresh, settings.tiles_cache_ttl)
+
+    except Exception as e:
+        if isinstance(e, APIError):
+            raise
+        logger.error(
+            "Error processing tile batch request",
+            extra={"error": str(e), "tiles": len(body.tiles)},
+            exc_info=True,
+        )
+        raise APIError(
+            message="Internal server error processing tile batch",
+            status_code=500,
+        )
+
+    def frames():
+        for entry in plan:
+            data = b""
+            if entry is not None:
+                source, dz, dx, dy = entry
+                data = sources[source] or b""
+                if data and dz:
+                    data = overzoom(data, dz, dx, dy)
+            yield struct.pack(">I", len(data)) + data
+
+    return StreamingResponse(frames(), media_type="application/octet-stream")
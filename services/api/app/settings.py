@@ -2,6 +2,8 @@ from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
+from tsg_common.tiles.render import TILES_MAX_BYTES
+
 
 class Settings(BaseSettings):
     # CORS settings
@@ -14,6 +16,69 @@ class Settings(BaseSettings):
     tiles_cache_ttl: int = 604800  # 7 days
     quickfacts_cache_ttl: int = 86400  # 24 hours
 
+    # HTTP caching: ETags follow the dataset version, which is re-read
+    # from the DB at most every `dataset_version_ttl` seconds per worker.
+    # Tile URLs carry no version, so browsers and CDNs keep them briefly
+    # and then revalidate (a cheap 304) to notice an ETL refresh
+    dataset_version_ttl: int = 60
+    tiles_cache_control: str = "public, max-age=300"
+    quickfacts_cache_control: str = "public, max-age=86400"
+
+    # Answer tiles the ETL-built coverage index knows are empty with a 204
+    tiles_coverage_enabled: bool = True
+
+    # Per-layer mvt byte budget; bigger renders are retried coarser
+    # (composite tiles get the sum of their layers' budgets)
+    tiles_max_bytes: dict[str, int] = TILES_MAX_BYTES
+
+    # Deeper mvt requests are cut from their ancestor at this zoom
+    # in-process instead of being rendered and cached (None disables)
+    tiles_max_data_zoom: Optional[int] = 14
+
+    # Static tile archives: {layer}.mbtiles exported by the ETL, kept per
+    # dataset version under `tiles_archive_dir/{version}/`; only archives
+    # stamped with the live version are served. With a bucket set, each
+    # worker fetches the live version's archives from
+    # `{tiles_archive_s3_prefix}/{version}/` (the ETL's `{S3_PREFIX}/tiles`)
+    tiles_archive_dir: Optional[str] = None
+    tiles_archive_s3_bucket: Optional[str] = None
+    tiles_archive_s3_prefix: str = "tiles"
+
+    # Answer /v1/places/nearby from a per-worker KD-tree of place centroids
+    # (rebuilt on each new dataset version) instead of PostGIS
+    places_index_enabled: bool = True
+
+    # Answer /v1/reverse from per-worker STRtrees of state, county, MSA and
+    # place polygons instead of PostGIS
+    reverse_index_enabled: bool = True
+
+    # Resolve /v1/reverse points in ETL-classified interior grid cells by
+    # array lookup; only boundary cells reach the polygons
+    reverse_cells_enabled: bool = True
+
+    # Redis cache for nearby/reverse answers, keyed on coordinates snapped
+    # to `geo_cache_precision` decimal places (4 ≈ 11 m) and the dataset
+    # version. Off by default: snapping moves the query point slightly
+    geo_cache_enabled: bool = False
+    geo_cache_precision: int = 4
+    nearby_cache_ttl: int = 3600  # 1 hour
+    reverse_cache_ttl: int = 86400  # 24 hours
+
+    # Bulk geocoding jobs: input and output files live in `jobs_s3_bucket`
+    # (jobs are disabled without one); the worker enriches
+    # `jobs_chunk_rows` rows at a time
+    jobs_s3_bucket: Optional[str] = None
+    jobs_s3_prefix: str = "geocode-jobs"
+    aws_region: str = "us-east-1"
+    s3_endpoint: Optional[str] = None
+    jobs_chunk_rows: int = 50_000
+    jobs_poll_seconds: float = 2.0
+    jobs_url_ttl: int = 3600  # presigned output URL lifetime
+    # A running job whose worker has not heartbeated for this long is
+    # reclaimed by another worker, at most `jobs_max_attempts` claims in all
+    jobs_lease_seconds: int = 300
+    jobs_max_attempts: int = 3
+
     # Logging settings
     log_level: str = "INFO"
 
@@ -0,0 +1,5 @@
+from .places_index import PlacesIndex
+from .reverse_cells import ReverseCells
+from .reverse_index import ReverseIndex
+
+__all__ = ["PlacesIndex", "ReverseCells", "ReverseIndex"]
@@ -0,0 +1,101 @@
+"""
+In-memory nearest-place search over every Place centroid (~30k points).
+
+Points live on the unit sphere as 3D vectors, so a plain Euclidean KD-tree
+answers great-circle queries: chord length grows monotonically with arc
+length, and a radius converts to a chord bound.
+"""
+
+import math
+from typing import Sequence
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sqlalchemy.engine import RowMapping
+
+# mean Earth radius (IUGG); distances differ from PostGIS' spheroidal
+# geography by well under 0.5%
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _unit_vectors(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    lat_rad, lon_rad = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack(
+        (cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad))
+    )
+
+
+class PlacesIndex:
+    """
+    Drop-in for `ReadQueries.nearby_places` / `nearest_places`, built from
+    `place_points`.
+    """
+
+    def __init__(self, rows: Sequence[RowMapping]):
+        self.geoids = [r["geoid"] for r in rows]
+        self.names = [r["name"] for r in rows]
+        self.lat = np.fromiter((r["lat"] for r in rows), float, len(rows))
+        self.lon = np.fromiter((r["lon"] for r in rows), float, len(rows))
+        self.tree = cKDTree(_unit_vectors(self.lat, self.lon))
+
+    def __len__(self) -> int:
+        return len(self.geoids)
+
+    def nearby_places(
+        self, lat: float, lon: float, radius_km: float = 50, limit: int = 25
+    ) -> list[dict]:
+        """Same rows as the PostGIS query: nearest first, distance in km."""
+        return self.nearest_places(lat, lon, limit, radius_km)
+
+    def nearest_places(
+        self,
+        lat: float,
+        lon: float,
+        limit: int = 25,
+        radius_km: float | None = None,
+    ) -> list[dict]:
+        """The `limit` nearest places, optionally within `radius_km`."""
+        return self.nearest_places_many([(lat, lon)], limit, radius_km)[0]
+
+    def nearest_places_many(
+        self,
+        points: Sequence[tuple[float, float]],
+        limit: int = 25,
+        radius_km: float | None = None,
+    ) -> list[list[dict]]:
+        """`nearest_places` for every (lat, lon) in one vectorised tree query."""
+        if not self.geoids:
+            return [[] for _ in points]
+
+        max_chord = math.inf
+        if radius_km is not None:
+            angle = min(radius_km / EARTH_RADIUS_KM, math.pi)
+            # tiny slack so a place exactly on the radius is kept
+            max_chord = 2 * math.sin(angle / 2) * (1 + 1e-12)
+
+        lat = np.fromiter((p[0] for p in points), float, len(points))
+        lon = np.fromiter((p[1] for p in points), float, len(points))
+        chords, idxs = self.tree.query(
+            _unit_vectors(lat, lon),
+            k=min(limit, len(self.geoids)),
+            distance_upper_bound=max_chord,
+        )
+        # k == 1 drops the neighbour axis
+        chords = chords.reshape(len(points), -1)
+        idxs = idxs.reshape(len(points), -1)
+
+        return [self._rows(c, i) for c, i in zip(chords, idxs)]
+
+    def _rows(self, chords: np.ndarray, idxs: np.ndarray) -> list[dict]:
+        found = np.isfinite(chords)
+        return [
+            {
+                "geoid": self.geoids[i],
+                "name": self.names[i],
+                "distance_km": 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0)),
+                "lat": float(self.lat[i]),
+                "lon": float(self.lon[i]),
+            }
+            for chord, i in zip(chords[found], idxs[found])
+        ]
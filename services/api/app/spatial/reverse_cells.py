@@ -0,0 +1,159 @@
+"""
+Reverse geocoding by array lookup for points in grid cells the ETL found to
+lie wholly inside one polygon (`reverse_cells` table). Only points in cells
+a boundary crosses go on to a polygon test.
+
+Each zoom level is a sorted array of `(x << z) | y` Web-Mercator tile codes
+with the owning polygon alongside, so a batch of points is resolved with one
+`searchsorted` per level.
+"""
+
+import math
+from bisect import bisect_left
+from typing import Sequence
+
+import numpy as np
+from tsg_common.db import ReadQueries
+from tsg_common.db.read_queries import REVERSE_MODELS
+from tsg_common.tiles.tile_math import MAX_LAT, lonlat_to_tile
+
+from .reverse_index import ReverseIndex
+
+
+def _tiles(lat: np.ndarray, lon: np.ndarray, z: int) -> tuple[np.ndarray, ...]:
+    """
+    Vectorised `lonlat_to_tile`, plus a mask of points lying exactly on a
+    tile edge.
+    """
+    n = 1 << z
+    lat_rad = np.radians(np.clip(lat, -MAX_LAT, MAX_LAT))
+    fx = (lon + 180.0) / 360.0 * n
+    fy = (1.0 - np.arcsinh(np.tan(lat_rad)) / np.pi) / 2.0 * n
+    x, y = np.floor(fx), np.floor(fy)
+    return (
+        np.clip(x, 0, n - 1).astype(np.uint64),
+        np.clip(y, 0, n - 1).astype(np.uint64),
+        (fx == x) | (fy == y),
+    )
+
+
+def _on_tile_edge(lat: float, lon: float, z: int) -> bool:
+    n = 1 << z
+    lat_rad = math.radians(max(-MAX_LAT, min(MAX_LAT, lat)))
+    fx = (lon + 180.0) / 360.0 * n
+    fy = (1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n
+    return fx.is_integer() or fy.is_integer()
+
+
+class _LayerCells:
+    def __init__(
+        self, levels: dict[int, tuple[bytes, list[str]]], names: dict[str, str]
+    ):
+        geoids = sorted({g for _, owners in levels.values() for g in owners})
+        position = {g: i for i, g in enumerate(geoids)}
+        self.rows = [{"geoid": g, "name": names[g]} for g in geoids]
+        self.max_zoom = max(levels)
+        self.levels = [
+            (
+                z,
+                np.frombuffer(cells, dtype="<u8"),
+                np.fromiter((position[g] for g in owners), np.int64, len(owners)),
+            )
+            for z, (cells, owners) in sorted(levels.items())
+        ]
+        # plain-Python copies: a single point is cheaper to bisect than to
+        # push through numpy
+        self.lists = [
+            (z, codes.tolist(), owners.tolist()) for z, codes, owners in self.levels
+        ]
+
+    def owner(self, lat: float, lon: float) -> int:
+        """
+        Index into `rows` of the polygon holding the point, -1 if unknown.
+        Points on a cell edge are always unknown: the edge may be the
+        polygon's boundary, which does not contain them.
+        """
+        if _on_tile_edge(lat, lon, self.max_zoom):
+            return -1
+        x, y = lonlat_to_tile(lon, lat, self.max_zoom)
+        for z, codes, owners in self.lists:
+            shift = self.max_zoom - z
+            code = ((x >> shift) << z) | (y >> shift)
+            i = bisect_left(codes, code)
+            if i < len(codes) and codes[i] == code:
+                return owners[i]
+        return -1
+
+    def owners(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """`owner` of every point."""
+        x, y, edge = _tiles(lat, lon, self.max_zoom)
+        out = np.full(len(lat), -1, dtype=np.int64)
+        for z, codes, owners in self.levels:
+            shift = np.uint64(self.max_zoom - z)
+            code = ((x >> shift) << np.uint64(z)) | (y >> shift)
+            i = np.minimum(np.searchsorted(codes, code), len(codes) - 1)
+            hit = codes[i] == code
+            out[hit] = owners[i[hit]]
+        out[edge] = -1
+        return out
+
+
+class ReverseCells:
+    """
+    Front for a `reverse_lookup_many` source (STRtree index or ReadQueries)
+    that answers interior-cell points itself and passes the rest on.
+    """
+
+    def __init__(
+        self,
+        levels: dict[str, dict[int, tuple[bytes, list[str]]]],
+        names: dict[str, dict[str, str]],
+    ):
+        self.layers = {
+            layer: _LayerCells(layer_levels, names[layer])
+            for layer, layer_levels in levels.items()
+            if layer_levels
+        }
+
+    def reverse_lookup_many(
+        self,
+        points: Sequence[tuple[float, float]],
+        layers: tuple[str, ...],
+        fallback: ReverseIndex | ReadQueries,
+    ) -> list[dict[str, dict | None]]:
+        pts = np.asarray(points, dtype=float).reshape(-1, 2)
+        lat, lon = pts.T
+
+        # one column of results per requested layer, None = unresolved
+        columns: dict[str, list[dict | None]] = {}
+        for layer, (key, _) in REVERSE_MODELS.items():
+            if layer not in layers:
+                continue
+            cells = self.layers.get(layer)
+            if cells is None:
+                columns[key] = [None] * len(pts)
+            elif len(pts) == 1:
+                i = cells.owner(lat[0], lon[0])
+                columns[key] = [cells.rows[i] if i >= 0 else None]
+            else:
+                rows = cells.rows
+                columns[key] = [
+                    rows[i] if i >= 0 else None
+                    for i in cells.owners(lat, lon).tolist()
+                ]
+
+        if not columns:
+            return [{} for _ in range(len(pts))]
+
+        unresolved = [
+            i for i, row in enumerate(zip(*columns.values())) if None in row
+        ]
+        if unresolved:
+            slow = fallback.reverse_lookup_many(pts[unresolved], layers)
+            for i, found in zip(unresolved, slow):
+                for key, column in columns.items():
+                    if column[i] is None:
+                        column[i] = found[key]
+
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
@@ -0,0 +1,63 @@
+"""
+In-memory point-in-polygon search over the reverse-geocoding layers (~50
+states, ~3k counties, ~900 CBSAs and the loaded places).
+
+Each layer's polygons sit in a Shapely STRtree; the tree narrows a point to
+the few polygons whose bounding box holds it, and prepared geometries make
+the exact containment test cheap even for big coastal multipolygons.
+"""
+
+from typing import Sequence
+
+import numpy as np
+import shapely
+from sqlalchemy.engine import RowMapping
+from tsg_common.db.read_queries import REVERSE_MODELS
+
+
+class _LayerTree:
+    def __init__(self, rows: Sequence[RowMapping]):
+        self.rows = [{"geoid": r["geoid"], "name": r["name"]} for r in rows]
+        self.geoms = shapely.from_wkb([bytes(r["wkb"]) for r in rows])
+        shapely.prepare(self.geoms)
+        self.tree = shapely.STRtree(self.geoms)
+
+    def containing(self, points: np.ndarray) -> list[dict | None]:
+        """A polygon holding each point (like LIMIT 1 in SQL), or None."""
+        out: list[dict | None] = [None] * len(points)
+        pt_idx, geom_idx = self.tree.query(points)
+        # ST_Contains semantics: points on a boundary match neither side
+        hit = shapely.contains(self.geoms[geom_idx], points[pt_idx])
+        for p, g in zip(pt_idx[hit], geom_idx[hit]):
+            if out[p] is None:
+                out[p] = self.rows[g]
+        return out
+
+
+class ReverseIndex:
+    """
+    Drop-in for `ReadQueries.reverse_lookup`, built from `layer_polygons`
+    of every layer in REVERSE_MODELS.
+    """
+
+    def __init__(self, polygons: dict[str, Sequence[RowMapping]]):
+        self.trees = {layer: _LayerTree(rows) for layer, rows in polygons.items()}
+
+    def reverse_lookup(
+        self, lat: float, lon: float, layers: tuple[str, ...] = ("counties", "msas")
+    ) -> dict[str, dict | None]:
+        return self.reverse_lookup_many([(lat, lon)], layers)[0]
+
+    def reverse_lookup_many(
+        self, points: Sequence[tuple[float, float]], layers: tuple[str, ...]
+    ) -> list[dict[str, dict | None]]:
+        """`reverse_lookup` for each (lat, lon), one vectorised query per layer."""
+        lat, lon = np.asarray(points, dtype=float).reshape(-1, 2).T
+        geoms = shapely.points(lon, lat)
+        out: list[dict[str, dict | None]] = [{} for _ in points]
+        for layer, (key, _) in REVERSE_MODELS.items():
+            if layer not in layers:
+                continue
+            for result, row in zip(out, self.trees[layer].containing(geoms)):
+                result[key] = row
+        return out
@@ -0,0 +1,295 @@
+"""
+Bulk geocoding worker: `python -m app.worker`.
+
+Claims queued `geocode_jobs` one at a time, streams the input file from S3
+in chunks of `jobs_chunk_rows` rows, appends county, MSA, place and
+nearest-place columns to each chunk with the same vectorised lookups as
+`/v1/reverse:batch`, and uploads the enriched file under
+`{jobs_s3_prefix}/output/`.
+It runs as its own process, so long jobs never hold API workers.
+"""
+
+import csv
+import logging
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.orm import Session
+from tsg_common.db import ReadQueries, WriteQueries
+from tsg_common.db.engine import SessionLocal
+from tsg_common.s3_utils import download_to_tempfile, upload_file
+
+from app.deps import (
+    get_dataset_version,
+    get_places_index,
+    get_reverse_cells,
+    get_reverse_index,
+    get_s3,
+)
+from app.logging_config import setup_logging
+from app.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# reverse layer -> output column prefix
+REVERSE_COLUMNS = {"counties": "county", "msas": "msa", "places": "place"}
+
+OUTPUT_FIELDS = [
+    pa.field(f"{prefix}_{attr}", pa.string())
+    for prefix in (*REVERSE_COLUMNS.values(), "nearest_place")
+    for attr in ("geoid", "name")
+] + [pa.field("nearest_place_distance_km", pa.float64())]
+
+# CSV inputs are read in blocks of this many bytes, then re-sliced to
+# `jobs_chunk_rows`
+CSV_BLOCK_SIZE = 16 << 20
+
+
+# a decimal number, as CSV coordinates are allowed to be
+NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+
+def _csv_reader(path: Path):
+    with open(path, newline="") as f:
+        header = next(csv.reader(f), [])
+    # every column, coordinates included, stays text, so values round-trip
+    # unchanged and no block can disagree with the first one's inferred types
+    types = {name: pa.string() for name in header}
+    return pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=pacsv.ConvertOptions(column_types=types),
+    )
+
+
+def _open_input(
+    path: Path, fmt: str, chunk_rows: int
+) -> tuple[pa.Schema, Iterator[pa.RecordBatch]]:
+    """Input schema and its record batches of at most `chunk_rows` rows."""
+    if fmt == "parquet":
+        parquet = pq.ParquetFile(path)
+        return parquet.schema_arrow, parquet.iter_batches(batch_size=chunk_rows)
+
+    reader = _csv_reader(path)
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        for batch in reader:
+            for start in range(0, batch.num_rows, chunk_rows):
+                yield batch.slice(start, chunk_rows)
+
+    return reader.schema, batches()
+
+
+def _coordinates(batch: pa.RecordBatch, column: str) -> np.ndarray:
+    """A coordinate column as float64; nulls and unparsable text become NaN."""
+    values = batch.column(batch.schema.get_field_index(column))
+    if pa.types.is_string(values.type) or pa.types.is_large_string(values.type):
+        values = pc.utf8_trim_whitespace(values)
+        parsable = pc.match_substring_regex(values, NUMBER_PATTERN)
+        values = pc.if_else(parsable, values, pa.scalar(None, values.type))
+    return pc.cast(values, pa.float64()).to_numpy(zero_copy_only=False)
+
+
+def _enrich(db: Session, lat: np.ndarray, lon: np.ndarray) -> list[pa.Array]:
+    """OUTPUT_FIELDS columns for the points; invalid coordinates get nulls."""
+    # NaN (a null or unparsable value) fails both comparisons
+    valid = np.flatnonzero((np.abs(lat) <= 90.0) & (np.abs(lon) <= 180.0))
+    points = np.column_stack((lat[valid], lon[valid]))
+
+    dataset = get_dataset_version(db)
+    index = get_reverse_index(dataset)
+    cells = get_reverse_cells(dataset)
+    places = get_places_index(dataset)
+
+    layers = tuple(REVERSE_COLUMNS)
+    source = index if index is not None else ReadQueries(db)
+    if not len(points):
+        found: list[dict] = []
+    elif cells is not None:
+        found = cells.reverse_lookup_many(points, layers, source)
+    else:
+        found = source.reverse_lookup_many(points, layers)
+
+    if not len(points):
+        nearest: list[list[Any]] = []
+    elif places is not None:
+        nearest = places.nearest_places_many(points, 1)
+    else:
+        nearest = ReadQueries(db).nearest_places_many(points.tolist(), 1)
+
+    n = len(lat)
+    columns: list[list[Any]] = []
+    for prefix in REVERSE_COLUMNS.values():
+        geoids: list[Any] = [None] * n
+        names: list[Any] = [None] * n
+        for i, result in zip(valid.tolist(), found):
+            row = result[prefix]
+            if row is not None:
+                geoids[i], names[i] = row["geoid"], row["name"]
+        columns += [geoids, names]
+
+    geoids, names, distances = [None] * n, [None] * n, [None] * n
+    for i, rows in zip(valid.tolist(), nearest):
+        if rows:
+            geoids[i] = rows[0]["geoid"]
+            names[i] = rows[0]["name"]
+            distances[i] = float(rows[0]["distance_km"])
+    columns += [geoids, names, distances]
+
+    return [pa.array(c, f.type) for c, f in zip(columns, OUTPUT_FIELDS)]
+
+
+@contextmanager
+def _heartbeat(job_id: str, interval: float) -> Iterator[None]:
+    """
+    Renew the job's lease every `interval` seconds from a side thread (with
+    its own session), so slow downloads and chunks never look like a dead
+    worker.
+    """
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(interval):
+            db = SessionLocal()
+            try:
+                WriteQueries(db).heartbeat_geocode_job(job_id)
+            except Exception as e:
+                logger.warning(
+                    "Geocoding job heartbeat failed",
+                    extra={"job_id": job_id, "error": str(e)},
+                )
+            finally:
+                db.close()
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(db: Session, s3: Any, job: RowMapping) -> str:
+    """Enrich a claimed job's input and upload it; returns the output key."""
+    settings = get_settings()
+    bucket = settings.jobs_s3_bucket
+    wq = WriteQueries(db)
+
+    local = download_to_tempfile(s3, bucket, job["input_key"])
+    try:
+        schema, batches = _open_input(local, job["format"], settings.jobs_chunk_rows)
+        for column in (job["lat_column"], job["lon_column"]):
+            if schema.get_field_index(column) < 0:
+                raise ValueError(f"input has no column {column!r}")
+
+        out_schema = pa.schema([*schema, *OUTPUT_FIELDS])
+        out_path = local.with_name(f"{job['id']}.{job['format']}")
+        if job["format"] == "parquet":
+            writer = pq.ParquetWriter(out_path, out_schema)
+        else:
+            writer = pacsv.CSVWriter(out_path, out_schema)
+
+        rows_done = 0
+        with writer:
+            for batch in batches:
+                lat = _coordinates(batch, job["lat_column"])
+                lon = _coordinates(batch, job["lon_column"])
+                writer.write_batch(
+                    pa.RecordBatch.from_arrays(
+                        [*batch.columns, *_enrich(db, lat, lon)],
+                        schema=out_schema,
+                    )
+                )
+                rows_done += batch.num_rows
+                wq.set_geocode_job_progress(job["id"], rows_done)
+
+        output_key = f"{settings.jobs_s3_prefix.strip('/')}/output/{out_path.name}"
+        upload_file(s3, out_path, bucket, output_key)
+        return output_key
+    finally:
+        shutil.rmtree(local.parent, ignore_errors=True)
+
+
+def _process(db: Session, s3: Any, job: RowMapping) -> None:
+    """Run a claimed job and record its outcome."""
+    settings = get_settings()
+    started = time.monotonic()
+    logger.info(
+        "Geocoding job started",
+        extra={
+            "job_id": job["id"],
+            "input_key": job["input_key"],
+            "attempt": job["attempts"],
+        },
+    )
+    try:
+        with _heartbeat(job["id"], settings.jobs_lease_seconds / 5):
+            output_key = run_job(db, s3, job)
+    except Exception as e:
+        db.rollback()
+        logger.error(
+            "Geocoding job failed",
+            extra={"job_id": job["id"], "error": str(e)},
+            exc_info=True,
+        )
+        WriteQueries(db).finish_geocode_job(job["id"], error=str(e))
+        return
+
+    WriteQueries(db).finish_geocode_job(job["id"], output_key=output_key)
+    logger.info(
+        "Geocoding job finished",
+        extra={
+            "job_id": job["id"],
+            "output_key": output_key,
+            "seconds": round(time.monotonic() - started, 3),
+        },
+    )
+
+
+def main() -> None:
+    setup_logging()
+    settings = get_settings()
+    if not settings.jobs_s3_bucket:
+        raise SystemExit("JOBS_S3_BUCKET is not set")
+    s3 = get_s3()
+
+    logger.info("Geocoding worker started", extra={"bucket": settings.jobs_s3_bucket})
+    backoff = settings.jobs_poll_seconds
+    while True:
+        db = SessionLocal()
+        try:
+            job = WriteQueries(db).claim_geocode_job(
+                settings.jobs_lease_seconds, settings.jobs_max_attempts
+            )
+            if job is None:
+                time.sleep(settings.jobs_poll_seconds)
+            else:
+                _process(db, s3, job)
+            backoff = settings.jobs_poll_seconds
+        except Exception as e:
+            # DB or S3 outage: a job claimed here is picked up again once its
+            # lease runs out, so just wait and keep polling
+            logger.error(
+                "Geocoding worker error",
+                extra={"error": str(e), "retry_in": backoff},
+                exc_info=True,
+            )
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60.0)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import os
+
+# tsg_common builds its DB and cache settings at import time; nothing here
+# connects to either
+for name, value in {
+    "DB_USER": "test",
+    "DB_PASS": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "test",
+    "CACHE_URL": "redis://localhost:6379/0",
+}.items():
+    os.environ.setdefault(name, value)
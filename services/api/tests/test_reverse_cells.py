@@ -0,0 +1,84 @@
+import numpy as np
+from tsg_common.db.read_queries import REVERSE_MODELS
+from tsg_common.tiles.tile_math import lonlat_to_tile
+
+from app.spatial.reverse_cells import ReverseCells
+
+# Chicago and Denver, plus a point in the Atlantic
+CHICAGO = (41.88, -87.63)
+DENVER = (39.74, -104.99)
+OCEAN = (35.0, -40.0)
+
+
+def _code(lat: float, lon: float, z: int) -> int:
+    x, y = lonlat_to_tile(lon, lat, z)
+    return (x << z) | y
+
+
+def _level(codes_owners: list[tuple[int, str]]) -> tuple[bytes, list[str]]:
+    codes_owners = sorted(codes_owners)
+    codes = np.array([c for c, _ in codes_owners], dtype="<u8").tobytes()
+    return codes, [g for _, g in codes_owners]
+
+
+class FakeFallback:
+    def __init__(self):
+        self.calls: list[list[tuple[float, float]]] = []
+
+    def reverse_lookup_many(self, points, layers):
+        self.calls.append([tuple(p) for p in np.asarray(points).tolist()])
+        row = {"geoid": "fallback", "name": "F"}
+        keys = [REVERSE_MODELS[layer][0] for layer in layers]
+        return [dict.fromkeys(keys, row) for _ in points]
+
+
+def _cells() -> ReverseCells:
+    # Chicago's cell at z6, Denver's at z10
+    levels = {
+        "counties": {
+            6: _level([(_code(*CHICAGO, 6), "17031")]),
+            10: _level([(_code(*DENVER, 10), "08031")]),
+        }
+    }
+    names = {"counties": {"17031": "Cook", "08031": "Denver"}}
+    return ReverseCells(levels, names)
+
+
+def test_interior_points_resolve_without_fallback():
+    fallback = FakeFallback()
+    found = _cells().reverse_lookup_many([CHICAGO, DENVER], ("counties",), fallback)
+    assert [row["county"]["geoid"] for row in found] == ["17031", "08031"]
+    assert fallback.calls == []
+
+
+def test_unknown_points_go_to_fallback():
+    fallback = FakeFallback()
+    found = _cells().reverse_lookup_many(
+        [CHICAGO, OCEAN, DENVER], ("counties",), fallback
+    )
+    assert [row["county"]["geoid"] for row in found] == ["17031", "fallback", "08031"]
+    assert fallback.calls == [[OCEAN]]
+
+
+def test_single_point_matches_batch():
+    cells = _cells()
+    for point in (CHICAGO, DENVER, OCEAN):
+        single = cells.reverse_lookup_many([point], ("counties",), FakeFallback())
+        batch = cells.reverse_lookup_many([point, point], ("counties",), FakeFallback())
+        assert single == batch[:1]
+
+
+def test_point_on_cell_edge_is_unresolved():
+    # lon -90 is a tile edge at every zoom from 2 up
+    edge = (41.88, -90.0)
+    layer = _cells().layers["counties"]
+    assert layer.owner(*edge) == -1
+    assert layer.owners(np.array([edge[0]]), np.array([edge[1]])).tolist() == [-1]
+
+
+def test_layers_without_cells_are_left_to_fallback():
+    fallback = FakeFallback()
+    found = _cells().reverse_lookup_many([CHICAGO], ("counties", "msas"), fallback)
+    assert found[0]["county"]["geoid"] == "17031"
+    assert found[0]["msa"]["geoid"] == "fallback"
+    assert fallback.calls == [[CHICAGO]]
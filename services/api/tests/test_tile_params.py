@@ -0,0 +1,34 @@
+import pytest
+
+from app.middleware.error_handler import APIError
+from app.routers.tiles import MAX_TILE_FACTS, _parse_facts, _parse_layers
+
+
+def test_layers_are_deduplicated_in_canonical_order():
+    assert _parse_layers("places,states,places") == ["states", "places"]
+    assert _parse_layers("counties,,msas") == ["counties", "msas"]
+
+
+@pytest.mark.parametrize("layer", ["", ",", "states,rivers"])
+def test_unknown_or_missing_layers_are_rejected(layer):
+    with pytest.raises(APIError) as e:
+        _parse_layers(layer)
+    assert e.value.status_code == 422
+
+
+def test_facts_are_deduplicated_and_sorted():
+    assert _parse_facts(["pop", "", "area, land", "pop"]) == ("area, land", "pop")
+    assert _parse_facts([]) == ()
+
+
+def test_reserved_facts_are_rejected():
+    with pytest.raises(APIError) as e:
+        _parse_facts(["pop", "name"])
+    assert e.value.status_code == 422
+    assert e.value.details["reserved"] == ["name"]
+
+
+def test_too_many_facts_are_rejected():
+    _parse_facts([f"f{i}" for i in range(MAX_TILE_FACTS)])
+    with pytest.raises(APIError):
+        _parse_facts([f"f{i}" for i in range(MAX_TILE_FACTS + 1)])
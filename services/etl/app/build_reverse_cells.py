@@ -0,0 +1,74 @@
+"""
+Classify a Web-Mercator quadtree against each reverse-geocoding layer.
+
+A cell is recorded at the coarsest zoom at which it lies wholly inside one
+polygon; the API answers any point in it without a polygon test. Cells a
+boundary crosses are split down to `max_zoom` and whatever is still mixed
+there is left out, so those points fall through to the polygon index.
+"""
+
+import sys
+from array import array
+from typing import Iterable
+
+import shapely
+from sqlalchemy.engine import RowMapping
+from tsg_common.tiles.tile_math import tile_mercator_bounds
+
+# clipped area / cell area at or above which a cell counts as interior
+# (slack for floating-point noise on metre-scale coordinates)
+FULL_FRACTION = 1 - 1e-9
+
+
+def _code(z: int, x: int, y: int) -> int:
+    return (x << z) | y
+
+
+def _interior_cells(
+    geom: shapely.Geometry,
+    z: int,
+    x: int,
+    y: int,
+    max_zoom: int,
+    out: list[tuple[int, int, int]],
+) -> None:
+    xmin, ymin, xmax, ymax = tile_mercator_bounds(z, x, y)
+    # each level only clips what the parent kept, so deep cells stay cheap
+    part = shapely.clip_by_rect(geom, xmin, ymin, xmax, ymax)
+    if part.is_empty:
+        return
+    if part.area >= (xmax - xmin) * (ymax - ymin) * FULL_FRACTION:
+        out.append((z, x, y))
+        return
+    if z == max_zoom:
+        return
+    for cx in (2 * x, 2 * x + 1):
+        for cy in (2 * y, 2 * y + 1):
+            _interior_cells(part, z + 1, cx, cy, max_zoom, out)
+
+
+def build_reverse_cells(
+    polygons: Iterable[RowMapping], max_zoom: int
+) -> dict[int, tuple[bytes, list[str]]]:
+    """
+    {zoom: (packed codes, geoids)} for `ReadQueries.layer_polygons(...,
+    mercator=True)` rows; codes are sorted little-endian uint64 `(x << z) | y`
+    with the containing geoid at the same position.
+    """
+    cells: dict[int, list[tuple[int, str]]] = {}
+    for row in polygons:
+        geom = shapely.make_valid(shapely.from_wkb(bytes(row["wkb"])))
+        found: list[tuple[int, int, int]] = []
+        _interior_cells(geom, 0, 0, 0, max_zoom, found)
+        for z, x, y in found:
+            cells.setdefault(z, []).append((_code(z, x, y), row["geoid"]))
+
+    levels: dict[int, tuple[bytes, list[str]]] = {}
+    for z, entries in sorted(cells.items()):
+        entries.sort()
+        codes = array("Q", (code for code, _ in entries))
+        # stored little-endian whatever the host byte order
+        if sys.byteorder != "little":
+            codes.byteswap()
+        levels[z] = (codes.tobytes(), [geoid for _, geoid in entries])
+    return levels
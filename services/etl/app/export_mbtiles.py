@@ -0,0 +1,168 @@
+"""
+Export each tile layer into a static MBTiles archive the API can serve
+without touching PostGIS or Redis.
+
+Archives are stamped with the dataset version they were rendered from and
+written to `{out}/{version}/{layer}.mbtiles`; `--upload` copies them to
+s3://$S3_BUCKET/$S3_PREFIX/tiles/{version}/, where API workers fetch the
+live version's archives. main.py runs the export on every ETL load when
+EXPORT_TILE_ARCHIVES is set; by hand it defaults to the live version:
+
+    python export_mbtiles.py --out /tmp/tiles --max-zoom 10 --upload
+"""
+
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from tsg_common.db import SessionLocal, ReadQueries
+from tsg_common.db.read_queries import TILE_MODELS
+from tsg_common.s3_utils import get_s3_client, upload_file
+from tsg_common.tiles.mbtiles import MBTilesWriter
+
+from settings import settings
+from tile_pyramid import render_pyramid, load_coverage, close_sessions
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+
+def export_layer(
+    layer: str,
+    out_dir: Path,
+    min_zoom: int,
+    max_zoom: int,
+    bbox: tuple[float, float, float, float],
+    pool: ThreadPoolExecutor,
+    workers: int,
+    version: str,
+) -> Path:
+    path = out_dir / f"{layer}.mbtiles"
+    written = 0
+    started = time.monotonic()
+    coverage = load_coverage(layer)
+
+    with MBTilesWriter(path, layer) as writer:
+        for z in range(min_zoom, max_zoom + 1):
+            for x, y, tile in render_pyramid(layer, z, bbox, pool, workers, coverage):
+                if tile is not None:
+                    writer.put_tile(z, x, y, tile)
+                    written += 1
+            logger.info("Exported %s z%d (%d tiles so far)", layer, z, written)
+        writer.finalize(min_zoom, max_zoom, bbox, version=version)
+
+    logger.info(
+        "Exported %s: %d tiles, %d bytes in %.1fs",
+        path,
+        written,
+        path.stat().st_size,
+        time.monotonic() - started,
+    )
+    return path
+
+
+def export_archives(
+    layers: list[str],
+    out_dir: Path,
+    min_zoom: int,
+    max_zoom: int,
+    bbox: tuple[float, float, float, float],
+    workers: int,
+    version: str,
+) -> list[Path]:
+    """Export every layer for dataset `version` into `out_dir/{version}/`."""
+    version_dir = out_dir / version
+    version_dir.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        paths = [
+            export_layer(
+                layer, version_dir, min_zoom, max_zoom, bbox, pool, workers, version
+            )
+            for layer in layers
+        ]
+    close_sessions()
+    return paths
+
+
+def upload_archives(paths: list[Path], version: str) -> None:
+    s3_client = get_s3_client(
+        region=settings.region,
+        endpoint=settings.s3_endpoint,
+    )
+    for path in paths:
+        key = f"{settings.s3_prefix}/tiles/{version}/{path.name}"
+        upload_file(s3_client, path, settings.s3_bucket, key)
+        logger.info("Uploaded %s to s3://%s/%s", path, settings.s3_bucket, key)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export tile layers to MBTiles")
+    parser.add_argument(
+        "--layers",
+        default=",".join(TILE_MODELS),
+        help="Comma-separated layers to export (default: all)",
+    )
+    parser.add_argument("--out", default=settings.tiles_archive_dir)
+    parser.add_argument("--min-zoom", type=int, default=settings.seed_min_zoom)
+    parser.add_argument("--max-zoom", type=int, default=settings.seed_max_zoom)
+    parser.add_argument(
+        "--bbox",
+        default=settings.seed_bbox,
+        help="min_lon,min_lat,max_lon,max_lat",
+    )
+    parser.add_argument("--workers", type=int, default=settings.seed_workers)
+    parser.add_argument(
+        "--version",
+        help="Dataset version to stamp (default: the live one); the API only "
+        "serves archives stamped with its live version",
+    )
+    parser.add_argument(
+        "--upload",
+        action="store_true",
+        help="Upload archives to s3://$S3_BUCKET/$S3_PREFIX/tiles/{version}/",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    layers = [layer for layer in args.layers.split(",") if layer]
+    unknown = set(layers) - set(TILE_MODELS)
+    if unknown:
+        raise SystemExit(f"Unknown layers: {', '.join(sorted(unknown))}")
+
+    min_lon, min_lat, max_lon, max_lat = (float(v) for v in args.bbox.split(","))
+    bbox = (min_lon, min_lat, max_lon, max_lat)
+
+    version = args.version
+    if version is None:
+        with SessionLocal() as db:
+            dataset = ReadQueries(db).dataset_version()
+        if dataset is None:
+            raise SystemExit("No dataset version recorded yet; run the ETL first")
+        version = dataset["version"]
+
+    paths = export_archives(
+        layers,
+        Path(args.out),
+        args.min_zoom,
+        args.max_zoom,
+        bbox,
+        args.workers,
+        version,
+    )
+    if args.upload:
+        upload_archives(paths, version)
+
+
+if __name__ == "__main__":
+    main()
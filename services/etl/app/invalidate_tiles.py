@@ -0,0 +1,84 @@
+"""
+Drop the cached tiles that rows changed by an ETL run can appear in, so a
+data refresh does not mean flushing the whole tile cache.
+
+Called from main.py with `WriteQueries.changed_bounds`; tiles are rendered
+lazily again on their next request (or by seed_tiles.py).
+"""
+
+import logging
+
+from tsg_common.cache import Cache
+from tsg_common.tiles import tiles_in_mercator_bbox
+from tsg_common.tiles.tile_math import BUFFER_FRACTION, MERCATOR_MAX
+
+logger = logging.getLogger(__name__)
+
+Affected = dict[int, set[tuple[int, int]]]
+
+
+def affected_tiles(
+    boxes: list[tuple[float, float, float, float]], max_zoom: int
+) -> Affected:
+    """Tiles per zoom (0..max_zoom) whose buffered extent touches any box."""
+    affected: Affected = {}
+    for z in range(max_zoom + 1):
+        pad = 2 * MERCATOR_MAX / (1 << z) * BUFFER_FRACTION
+        tiles: set[tuple[int, int]] = set()
+        for xmin, ymin, xmax, ymax in boxes:
+            padded = (xmin - pad, ymin - pad, xmax + pad, ymax + pad)
+            tiles.update(tiles_in_mercator_bbox(padded, z))
+        affected[z] = tiles
+    return affected
+
+
+def _is_affected(affected: Affected, max_zoom: int, z: int, x: int, y: int) -> bool:
+    # deeper tiles are judged by their ancestor at max_zoom
+    if z > max_zoom:
+        shift = z - max_zoom
+        z, x, y = max_zoom, x >> shift, y >> shift
+    return (x, y) in affected[z]
+
+
+def invalidate_tiles(
+    cache: Cache,
+    changed_bounds: dict[str, list[tuple[float, float, float, float]]],
+    max_zoom: int,
+    drop_facts: bool = True,
+) -> int:
+    """
+    Unlink every `tile:*` key (composites, simplify levels and encoded
+    variants included) of a layer with changes whose tile is affected.
+    With `drop_facts`, tiles embedding QuickFacts fields go too, since the
+    ETL reloads QuickFacts wholesale. Returns the number of keys removed.
+    """
+    affected = {
+        layer: affected_tiles(boxes, max_zoom)
+        for layer, boxes in changed_bounds.items()
+        if boxes
+    }
+    if not affected and not drop_facts:
+        return 0
+
+    deleted = 0
+    batch: list[bytes] = []
+    for key in cache.scan("tile:*"):
+        # tile:{layers}:{z}:{x}:{y}:{ext}[:s{simplify}][:f{facts}][:{encoding}]
+        _, layers, z, x, y, _, *suffixes = key.decode().split(":")
+        if (drop_facts and any(part.startswith("f") for part in suffixes)) or any(
+            layer in affected
+            and _is_affected(affected[layer], max_zoom, int(z), int(x), int(y))
+            for layer in layers.split(",")
+        ):
+            batch.append(key)
+        if len(batch) >= 1000:
+            deleted += cache.unlink(batch)
+            batch = []
+    deleted += cache.unlink(batch)
+
+    logger.info(
+        "Tile cache invalidated: %d keys across %s",
+        deleted,
+        ", ".join(sorted(affected)) or "no layers",
+    )
+    return deleted
@@ -1,13 +1,21 @@
 from collections import defaultdict
+from datetime import datetime, timezone
 import logging
 import sys
+from pathlib import Path
 from typing import Dict
 
+from tsg_common.cache import Cache
 from tsg_common.s3_utils import get_s3_client, iter_objects, download_to_tempfile
-from tsg_common.db import SessionLocal, WriteQueries
-from tsg_common.db.models import QuickFacts
+from tsg_common.db import SessionLocal, WriteQueries, ReadQueries
+from tsg_common.db.read_queries import REVERSE_MODELS
+from tsg_common.db.models import QuickFacts, State, County, MSA, Place
+from tsg_common.tiles.coverage import CoverageIndex
 
+from build_reverse_cells import build_reverse_cells
+from export_mbtiles import export_archives, upload_archives
 from extract_tiger_files import extract_tiger_files
+from invalidate_tiles import invalidate_tiles
 from tiger_s3_paths import TigerS3Paths
 from settings import settings
 from parse_quickfacts import parse_quickfacts
@@ -77,6 +85,69 @@ def main() -> None:
         wq.upsert_quickfacts(facts_rows)
         logger.info("Quickfacts written to database")
 
+        for table in (State, County, MSA, Place):
+            wq.refresh_generalized(table)
+            logger.info("Generalized geometries rebuilt for %s", table.__tablename__)
+            wq.refresh_subdivided(table)
+            logger.info("Subdivided geometries rebuilt for %s", table.__tablename__)
+
+        # Only tiles showing a changed row (or embedding QuickFacts) are
+        # dropped; the rest stay warm
+        for layer, boxes in wq.changed_bounds.items():
+            logger.info("%s: %d changed extents", layer, len(boxes))
+        invalidate_tiles(Cache(), wq.changed_bounds, settings.invalidate_max_zoom)
+
+        rq = ReadQueries(db)
+        for table in (State, County, MSA, Place):
+            layer = table.__tablename__
+            coverage = CoverageIndex.from_mercator_boxes(
+                rq.subdivided_bounds(layer), settings.coverage_max_zoom
+            )
+            wq.replace_tile_coverage(layer, coverage.to_blobs())
+            logger.info(
+                "Tile coverage built for %s: %d non-empty tiles at z%d",
+                layer,
+                len(coverage.levels[coverage.max_zoom]),
+                coverage.max_zoom,
+            )
+
+        for layer in REVERSE_MODELS:
+            levels = build_reverse_cells(
+                rq.layer_polygons(layer, mercator=True),
+                settings.reverse_cells_max_zoom,
+            )
+            wq.replace_reverse_cells(layer, levels)
+            logger.info(
+                "Reverse cells built for %s: %d interior cells down to z%d",
+                layer,
+                sum(len(geoids) for _, geoids in levels.values()),
+                settings.reverse_cells_max_zoom,
+            )
+
+        version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+        # Archives are stamped with the version about to go live and
+        # uploaded before it does; the API ignores any other version's
+        if settings.export_tile_archives:
+            min_lon, min_lat, max_lon, max_lat = (
+                float(v) for v in settings.seed_bbox.split(",")
+            )
+            paths = export_archives(
+                [table.__tablename__ for table in (State, County, MSA, Place)],
+                Path(settings.tiles_archive_dir),
+                settings.seed_min_zoom,
+                settings.seed_max_zoom,
+                (min_lon, min_lat, max_lon, max_lat),
+                settings.seed_workers,
+                version,
+            )
+            upload_archives(paths, version)
+            logger.info("Tile archives exported for version %s", version)
+
+        # Last step: bumping the version rolls every API ETag over
+        wq.record_dataset_version(version)
+        logger.info("Dataset version %s recorded", version)
+
 
 if __name__ == "__main__":
     main()
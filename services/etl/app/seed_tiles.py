@@ -0,0 +1,138 @@
+"""
+Pre-render the tile pyramid into Redis so map clients never pay for a cold
+PostGIS render after an ETL run or a cache flush.
+
+    python seed_tiles.py --layers states,counties --min-zoom 0 --max-zoom 8
+"""
+
+import argparse
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from tsg_common.cache import Cache
+from tsg_common.db.read_queries import TILE_MODELS
+from tsg_common.tiles import tile_key
+
+from settings import settings
+from tile_pyramid import render_pyramid, load_coverage, close_sessions
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)],
+)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SeedStats:
+    rendered: int = 0
+    empty: int = 0
+    bytes_written: int = 0
+
+
+def seed_tiles(
+    layers: list[str],
+    min_zoom: int,
+    max_zoom: int,
+    bbox: tuple[float, float, float, float],
+    workers: int,
+    ttl: int,
+) -> SeedStats:
+    cache = Cache()
+    stats = SeedStats()
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for layer in layers:
+            coverage = load_coverage(layer)
+            for z in range(min_zoom, max_zoom + 1):
+                for x, y, tile in render_pyramid(
+                    layer, z, bbox, pool, workers, coverage
+                ):
+                    if tile is None:
+                        stats.empty += 1
+                        continue
+                    # raw bytes plus the compressed variants the API serves
+                    cache.set_encoded(tile_key(layer, z, x, y, "mvt"), tile, ttl=ttl)
+                    stats.rendered += 1
+                    stats.bytes_written += len(tile)
+
+                elapsed = time.monotonic() - started
+                logger.info(
+                    "Seeded %s z%d (running total): %d tiles, %d empty, "
+                    "%.1f tiles/sec, %d bytes",
+                    layer,
+                    z,
+                    stats.rendered,
+                    stats.empty,
+                    (stats.rendered + stats.empty) / elapsed if elapsed else 0.0,
+                    stats.bytes_written,
+                )
+
+    close_sessions()
+
+    return stats
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pre-seed the Redis tile cache")
+    parser.add_argument(
+        "--layers",
+        default=",".join(TILE_MODELS),
+        help="Comma-separated layers to seed (default: all)",
+    )
+    parser.add_argument("--min-zoom", type=int, default=settings.seed_min_zoom)
+    parser.add_argument("--max-zoom", type=int, default=settings.seed_max_zoom)
+    parser.add_argument(
+        "--bbox",
+        default=settings.seed_bbox,
+        help="min_lon,min_lat,max_lon,max_lat",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.seed_workers,
+        help="Parallel renders, each holding one DB connection (pool max 15)",
+    )
+    parser.add_argument("--ttl", type=int, default=settings.tiles_cache_ttl)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    layers = [layer for layer in args.layers.split(",") if layer]
+    unknown = set(layers) - set(TILE_MODELS)
+    if unknown:
+        raise SystemExit(f"Unknown layers: {', '.join(sorted(unknown))}")
+
+    min_lon, min_lat, max_lon, max_lat = (float(v) for v in args.bbox.split(","))
+
+    started = time.monotonic()
+    stats = seed_tiles(
+        layers,
+        args.min_zoom,
+        args.max_zoom,
+        (min_lon, min_lat, max_lon, max_lat),
+        args.workers,
+        args.ttl,
+    )
+    elapsed = time.monotonic() - started
+
+    logger.info(
+        "Seeding done in %.1fs: %d tiles written, %d empty skipped, "
+        "%.1f tiles/sec, %d bytes written",
+        elapsed,
+        stats.rendered,
+        stats.empty,
+        (stats.rendered + stats.empty) / elapsed if elapsed else 0.0,
+        stats.bytes_written,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
+from tsg_common.tiles.render import TILES_MAX_BYTES
 
 
 class Settings(BaseSettings):
@@ -10,6 +11,33 @@ class Settings(BaseSettings):
     s3_prefix: str = Field(..., validation_alias="S3_PREFIX")
     region: str = Field("us-east-1", validation_alias="AWS_REGION")
 
+    # Tile pre-seeding (seed_tiles.py)
+    seed_min_zoom: int = Field(0, validation_alias="SEED_MIN_ZOOM")
+    seed_max_zoom: int = Field(8, validation_alias="SEED_MAX_ZOOM")
+    # min_lon,min_lat,max_lon,max_lat - defaults to the US incl. AK, HI & PR
+    seed_bbox: str = Field("-180,17.5,-64.5,71.5", validation_alias="SEED_BBOX")
+    seed_workers: int = Field(8, validation_alias="SEED_WORKERS")
+    tiles_cache_ttl: int = Field(604800, validation_alias="TILES_CACHE_TTL")
+    # Per-layer mvt byte budget, as in the API (keep the two in step)
+    tiles_max_bytes: dict[str, int] = Field(
+        TILES_MAX_BYTES, validation_alias="TILES_MAX_BYTES"
+    )
+
+    # Empty-tile coverage index, built down to this zoom
+    coverage_max_zoom: int = Field(12, validation_alias="COVERAGE_MAX_ZOOM")
+
+    # Reverse-geocoding interior cells, split down to this zoom
+    reverse_cells_max_zoom: int = Field(13, validation_alias="REVERSE_CELLS_MAX_ZOOM")
+
+    # Changed rows drop their cached tiles down to this zoom (deeper keys
+    # are matched through their ancestor at it)
+    invalidate_max_zoom: int = Field(12, validation_alias="INVALIDATE_MAX_ZOOM")
+
+    # Static MBTiles archive (export_mbtiles.py); with EXPORT_TILE_ARCHIVES
+    # main.py exports and uploads them for every new dataset version
+    tiles_archive_dir: str = Field("/tmp/tiles", validation_alias="TILES_ARCHIVE_DIR")
+    export_tile_archives: bool = Field(False, validation_alias="EXPORT_TILE_ARCHIVES")
+
     @field_validator("s3_endpoint")
     @classmethod
     def validate_s3_endpoint(cls, v: str | None) -> str | None:
@@ -0,0 +1,92 @@
+"""
+Parallel tile rendering shared by the Redis seeder and the MBTiles exporter.
+Renders run on a thread pool with one DB session per worker; results are
+handed back to the calling thread so sinks (Redis, SQLite) stay single-threaded.
+"""
+
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+from tsg_common.db import SessionLocal, ReadQueries
+from tsg_common.tiles import tiles_in_bbox
+from tsg_common.tiles.coverage import CoverageIndex
+from tsg_common.tiles.render import render_tile
+
+from settings import settings
+
+# renders queued per pool worker before the producer waits for results
+PENDING_PER_WORKER = 4
+
+# one DB session per worker thread, reused across tiles
+_local = threading.local()
+_sessions: list[Session] = []
+
+
+def _read_queries() -> ReadQueries:
+    if not hasattr(_local, "rq"):
+        db = SessionLocal()
+        _sessions.append(db)
+        _local.rq = ReadQueries(db)
+    return _local.rq
+
+
+def _render_tile(layer: str, z: int, x: int, y: int) -> tuple[int, int, bytes | None]:
+    # same renderer and byte budget as the API, so seeded and exported
+    # tiles match what it would render itself
+    tile = render_tile(
+        _read_queries(), [layer], z, x, y, max_bytes=settings.tiles_max_bytes
+    )
+    if not tile:
+        return x, y, None
+    return x, y, tile if isinstance(tile, (bytes, bytearray)) else str(tile).encode()
+
+
+def load_coverage(layer: str) -> CoverageIndex | None:
+    """The layer's ETL-built empty-tile index, or None if not built yet."""
+    with SessionLocal() as db:
+        blobs = ReadQueries(db).tile_coverage(layer)
+    return CoverageIndex.from_blobs(blobs) if blobs else None
+
+
+def render_pyramid(
+    layer: str,
+    z: int,
+    bbox: tuple[float, float, float, float],
+    pool: ThreadPoolExecutor,
+    workers: int,
+    coverage: CoverageIndex | None = None,
+) -> Iterator[tuple[int, int, bytes | None]]:
+    """
+    Render every tile of `layer` at zoom `z` inside `bbox`, yielding
+    (x, y, mvt) as renders complete. Empty tiles yield None; tiles
+    `coverage` knows are empty are skipped without a render. At most
+    PENDING_PER_WORKER renders per worker are in flight, so memory stays
+    flat however many tiles the zoom has.
+    """
+    pending: set[Future] = set()
+    for x, y in tiles_in_bbox(bbox, z):
+        if coverage is not None and coverage.is_empty(z, x, y):
+            continue
+        if len(pending) >= workers * PENDING_PER_WORKER:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+        pending.add(pool.submit(_render_tile, layer, z, x, y))
+
+    for fut in as_completed(pending):
+        yield fut.result()
+
+
+def close_sessions() -> None:
+    for db in _sessions:
+        db.close()
+    _sessions.clear()
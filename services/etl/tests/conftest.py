@@ -0,0 +1,18 @@
+import os
+import sys
+from pathlib import Path
+
+# tsg_common builds its DB and cache settings at import time; nothing here
+# connects to either
+for name, value in {
+    "DB_USER": "test",
+    "DB_PASS": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "test",
+    "CACHE_URL": "redis://localhost:6379/0",
+}.items():
+    os.environ.setdefault(name, value)
+
+# the ETL scripts import each other as top-level modules from app/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
@@ -0,0 +1,74 @@
+from tsg_common.tiles.tile_math import tile_key, tile_mercator_bounds
+
+from invalidate_tiles import affected_tiles, invalidate_tiles
+
+
+class FakeCache:
+    def __init__(self, keys: list[str]):
+        self.keys = {key.encode() for key in keys}
+
+    def scan(self, match: str, count: int = 1000):
+        prefix = match.rstrip("*").encode()
+        return iter(sorted(key for key in self.keys if key.startswith(prefix)))
+
+    def unlink(self, keys) -> int:
+        keys = set(keys)
+        removed = len(self.keys & keys)
+        self.keys -= keys
+        return removed
+
+
+def _box(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """A small box in the middle of a tile."""
+    xmin, ymin, xmax, ymax = tile_mercator_bounds(z, x, y)
+    dx, dy = (xmax - xmin) / 4, (ymax - ymin) / 4
+    return xmin + dx, ymin + dy, xmax - dx, ymax - dy
+
+
+def test_affected_tiles_cover_every_zoom():
+    affected = affected_tiles([_box(8, 40, 90)], 8)
+    assert sorted(affected) == list(range(9))
+    assert (40, 90) in affected[8]
+    assert (41, 90) not in affected[8]
+    assert (40 >> 3, 90 >> 3) in affected[5]
+
+
+def test_only_affected_keys_are_unlinked():
+    hit = tile_key("counties", 8, 40, 90, "mvt")
+    kept = [
+        tile_key("counties", 8, 41, 90, "mvt"),
+        tile_key("states", 8, 40, 90, "mvt"),
+        "qf:v2:counties:17031",
+    ]
+    cache = FakeCache([hit, *kept])
+    assert invalidate_tiles(cache, {"counties": [_box(8, 40, 90)]}, 8) == 1
+    assert cache.keys == {key.encode() for key in kept}
+
+
+def test_key_suffixes_and_composites_are_parsed():
+    keys = [
+        tile_key("counties", 8, 40, 90, "geojson", simplify=2),
+        tile_key("states,counties", 8, 40, 90, "mvt") + ":br",
+        tile_key("counties", 8, 40, 90, "mvt", simplify=1) + ":gzip",
+    ]
+    cache = FakeCache(keys)
+    assert invalidate_tiles(cache, {"counties": [_box(8, 40, 90)]}, 8) == 3
+    assert cache.keys == set()
+
+
+def test_deeper_tiles_follow_their_ancestor():
+    hit = tile_key("counties", 12, (40 << 4) + 3, (90 << 4) + 5, "mvt")
+    kept = tile_key("counties", 12, 41 << 4, 90 << 4, "mvt")
+    cache = FakeCache([hit, kept])
+    assert invalidate_tiles(cache, {"counties": [_box(8, 40, 90)]}, 8) == 1
+    assert cache.keys == {kept.encode()}
+
+
+def test_facts_tiles_go_only_with_drop_facts():
+    facts = tile_key("states", 3, 1, 2, "mvt", facts=["pop"])
+    plain = tile_key("states", 3, 1, 2, "mvt")
+
+    cache = FakeCache([facts, plain])
+    assert invalidate_tiles(cache, {}, 8, drop_facts=False) == 0
+    assert invalidate_tiles(cache, {}, 8) == 1
+    assert cache.keys == {plain.encode()}